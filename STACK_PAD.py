@@ -1,36 +1,75 @@
+import time
+_startup_started = time.perf_counter()
 import sys
+if __name__ == "__main__":
+    sys.modules.setdefault("STACK_PAD", sys.modules[__name__])
 import os
 from pathlib import Path
 from typing import Optional
 import ctypes
 from ctypes import wintypes
-import time
 import json
+import hashlib
+import gc
+import contextlib
+import tempfile
+import queue
+import threading
+import argparse
+import heapq
+import itertools
+import bisect
+import fnmatch
+import mmap
+import struct
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from functools import cached_property, wraps
+import atexit
+import logging
+import math
+import ipaddress
+import socket
+import stat
 
-from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QGridLayout, QPushButton, QLabel, QComboBox, QLineEdit, QDialog,
-    QDialogButtonBox, QFormLayout, QMessageBox, QSystemTrayIcon, QMenu, QStyle
-)
-from PySide6.QtCore import Qt, QPoint, QTimer, Signal
-from PySide6.QtGui import QIcon, QColor, QPixmap, QCursor
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+_startup_imported = time.perf_counter()
 
-from pydantic import BaseModel, Field, field_validator
+log = logging.getLogger("stack_pad")
 
 if sys.platform == "win32":
     import ctypes
     kernel32 = ctypes.windll.kernel32
     user32 = ctypes.windll.user32
     sw_hide = 0
-    kernel32.FreeConsole()
 
-try:
-    from pynput.keyboard import Key, Controller as KeyboardController
-    HAS_PYNPUT = True
-    keyboard = KeyboardController()
-except ImportError:
-    HAS_PYNPUT = False
-    keyboard = None
+HAS_PYNPUT: Optional[bool] = None
+keyboard = None
+PYNPUT_KEY_MAP: dict = {}
+_pynput_lock = threading.Lock()
+
+def load_pynput() -> bool:
+    global HAS_PYNPUT, keyboard, PYNPUT_KEY_MAP
+    with _pynput_lock:
+        if HAS_PYNPUT is None:
+            try:
+                from pynput.keyboard import Key, Controller as KeyboardController
+                keyboard = KeyboardController()
+                keys = {
+                    "F13": Key.f13, "F14": Key.f14, "F15": Key.f15, "F16": Key.f16,
+                    "F17": Key.f17, "F18": Key.f18, "F19": Key.f19, "F20": Key.f20,
+                    "F21": Key.f21, "F22": Key.f22, "F23": Key.f23, "F24": Key.f24,
+                    "Ctrl": Key.ctrl, "Shift": Key.shift, "Alt": Key.alt,
+                }
+                PYNPUT_KEY_MAP = {
+                    name: tuple(keys[modifier] for modifier in modifiers) + (keys[key_name],)
+                    for name, (modifiers, key_name) in CHORDS.items()
+                }
+                HAS_PYNPUT = True
+            except Exception:
+                HAS_PYNPUT = False
+        return HAS_PYNPUT
 
 INPUT_KEYBOARD = 1
 KEYEVENTF_KEYUP = 0x0002
@@ -41,1117 +80,3259 @@ VK = {
     "F21": 0x84, "F22": 0x85, "F23": 0x86, "F24": 0x87,
 }
 
-PYNPUT_KEY_MAP = {
-    "F13": Key.f13, "F14": Key.f14, "F15": Key.f15, "F16": Key.f16,
-    "F17": Key.f17, "F18": Key.f18, "F19": Key.f19, "F20": Key.f20,
-    "F21": Key.f21, "F22": Key.f22, "F23": Key.f23, "F24": Key.f24,
-}
+MODIFIER_VK = {"Ctrl": 0x11, "Shift": 0x10, "Alt": 0x12}
+
+MODIFIER_ALIASES = {"CTRL": "Ctrl", "CONTROL": "Ctrl", "SHIFT": "Shift", "ALT": "Alt"}
+
+def chord_name(modifiers, key_name: str) -> str:
+    return "+".join((*(modifier for modifier in MODIFIER_VK if modifier in modifiers), key_name))
+
+def _build_chords() -> dict[str, tuple[tuple[str, ...], str]]:
+    chords = {}
+    modifiers = tuple(MODIFIER_VK)
+    for mask in range(1 << len(modifiers)):
+        chosen = tuple(modifier for bit, modifier in enumerate(modifiers) if mask & (1 << bit))
+        for key_name in VK:
+            chords[chord_name(chosen, key_name)] = (chosen, key_name)
+    return chords
+
+CHORDS = _build_chords()
+CHORD_LOOKUP = {name.upper(): name for name in CHORDS}
+
+def canonical_chord(text: str) -> Optional[str]:
+    parts = [part.strip().upper() for part in text.split("+")]
+    modifiers = set()
+    for part in parts[:-1]:
+        modifier = MODIFIER_ALIASES.get(part)
+        if modifier is None:
+            return None
+        modifiers.add(modifier)
+    name = chord_name(modifiers, parts[-1])
+    return name if name in CHORDS else None
 
 def send_key(key_name: str, down_up_delay_ms: int = 25) -> bool:
-    key_name = key_name.upper().strip()
-    if key_name not in VK:
+    key_name = CHORD_LOOKUP.get(key_name.upper().strip())
+    if key_name is None:
         return False
-
-    if HAS_PYNPUT and key_name in PYNPUT_KEY_MAP:
-        try:
-            pynput_key = PYNPUT_KEY_MAP[key_name]
-            keyboard.press(pynput_key)
-            if down_up_delay_ms > 0:
-                time.sleep(down_up_delay_ms / 1000.0)
-            keyboard.release(pynput_key)
-            return True
-        except Exception:
-            pass
     
-    return _send_input_fallback(key_name, down_up_delay_ms)
+    return get_backend().tap(key_name, down_up_delay_ms)
 
-def _send_input_fallback(key_name: str, down_up_delay_ms: int) -> bool:
-    try:
-        user32 = ctypes.WinDLL("user32", use_last_error=True)
-        
-        class KEYBDINPUT(ctypes.Structure):
-            _fields_ = [
-                ("wVk", wintypes.WORD),
-                ("wScan", wintypes.WORD),
-                ("dwFlags", wintypes.DWORD),
-                ("time", wintypes.DWORD),
-                ("dwExtraInfo", ctypes.c_size_t),
-            ]
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ("wVk", wintypes.WORD),
+        ("wScan", wintypes.WORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ("dx", wintypes.LONG),
+        ("dy", wintypes.LONG),
+        ("mouseData", wintypes.DWORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
 
-        class INPUT_UNION(ctypes.Union):
-            _fields_ = [("ki", KEYBDINPUT)]
+class HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [
+        ("uMsg", wintypes.DWORD),
+        ("wParamL", wintypes.WORD),
+        ("wParamH", wintypes.WORD),
+    ]
 
-        class INPUT(ctypes.Structure):
-            _fields_ = [
-                ("type", wintypes.DWORD),
-                ("union", INPUT_UNION),
-            ]
+class INPUT_UNION(ctypes.Union):
+    _fields_ = [("ki", KEYBDINPUT), ("mi", MOUSEINPUT), ("hi", HARDWAREINPUT)]
 
-        vk = VK[key_name]
-        
-        ki_down = KEYBDINPUT(wVk=vk, wScan=0, dwFlags=0, time=0, dwExtraInfo=0)
-        union_down = INPUT_UNION(ki=ki_down)
-        inp_down = INPUT(type=INPUT_KEYBOARD, union=union_down)
-        result_down = user32.SendInput(1, ctypes.byref(inp_down), ctypes.sizeof(INPUT))
+class INPUT(ctypes.Structure):
+    _fields_ = [
+        ("type", wintypes.DWORD),
+        ("union", INPUT_UNION),
+    ]
+
+def _keyboard_input(vk: int, flags: int = 0) -> INPUT:
+    ki = KEYBDINPUT(wVk=vk, wScan=0, dwFlags=flags, time=0, dwExtraInfo=0)
+    return INPUT(type=INPUT_KEYBOARD, union=INPUT_UNION(ki=ki))
+
+class SendInputEngine:
+    
+    def __init__(self, user32=None):
+        if user32 is None:
+            user32 = ctypes.WinDLL("user32", use_last_error=True)
+            user32.SendInput.argtypes = (wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int)
+            user32.SendInput.restype = wintypes.UINT
+        self.user32 = user32
+        self.input_size = ctypes.sizeof(INPUT)
+        self._down: dict[str, ctypes.Array] = {}
+        self._up: dict[str, ctypes.Array] = {}
+        self._tap: dict[str, ctypes.Array] = {}
+        
+        for name, (modifiers, key_name) in CHORDS.items():
+            vks = [MODIFIER_VK[modifier] for modifier in modifiers] + [VK[key_name]]
+            down = [_keyboard_input(vk) for vk in vks]
+            up = [_keyboard_input(vk, KEYEVENTF_KEYUP) for vk in reversed(vks)]
+            self._down[name] = (INPUT * len(down))(*down)
+            self._up[name] = (INPUT * len(up))(*up)
+            self._tap[name] = (INPUT * (len(down) + len(up)))(*down, *up)
+    
+    def _send(self, inputs: ctypes.Array) -> bool:
+        return self.user32.SendInput(len(inputs), inputs, self.input_size) == len(inputs)
+    
+    def press(self, key_name: str) -> bool:
+        return self._send(self._down[key_name])
+    
+    def release(self, key_name: str) -> bool:
+        return self._send(self._up[key_name])
+    
+    def tap(self, key_name: str, down_up_delay_ms: int = 0) -> bool:
+        if down_up_delay_ms <= 0:
+            return self._send(self._tap[key_name])
         
-        if result_down == 0:
+        if not self.press(key_name):
             return False
-        
-        if down_up_delay_ms > 0:
-            time.sleep(down_up_delay_ms / 1000.0)
-        
-        ki_up = KEYBDINPUT(wVk=vk, wScan=0, dwFlags=KEYEVENTF_KEYUP, time=0, dwExtraInfo=0)
-        union_up = INPUT_UNION(ki=ki_up)
-        inp_up = INPUT(type=INPUT_KEYBOARD, union=union_up)
-        result_up = user32.SendInput(1, ctypes.byref(inp_up), ctypes.sizeof(INPUT))
-        
-        return result_up != 0
+        time.sleep(down_up_delay_ms / 1000.0)
+        return self.release(key_name)
+
+_send_input_engine: Optional[SendInputEngine] = None
+_send_input_unavailable = False
+
+def get_send_input_engine() -> Optional[SendInputEngine]:
+    global _send_input_engine, _send_input_unavailable
+    if _send_input_engine is None and not _send_input_unavailable:
+        try:
+            _send_input_engine = SendInputEngine()
+        except Exception:
+            _send_input_unavailable = True
+    return _send_input_engine
+
+def _send_input_fallback(key_name: str, down_up_delay_ms: int) -> bool:
+    engine = get_send_input_engine()
+    if engine is None:
+        return False
+    try:
+        return engine.tap(key_name, down_up_delay_ms)
     except Exception:
         return False
 
-def get_f_key_list() -> list[str]:
-    return list(VK.keys())
-
-class KeyBinding(BaseModel):
-    label: str = Field(default="", max_length=18)
-    color_tag: str = Field(default="gray")
-    output_key: str = Field(default="F13")
+class InjectionBackend:
     
-    @field_validator("color_tag")
-    @classmethod
-    def validate_color_tag(cls, v: str) -> str:
-        allowed = ["purple", "cyan", "green", "orange", "red", "blue", "yellow", "gray"]
-        if v not in allowed:
-            return "gray"
-        return v
+    name = "base"
     
-    @field_validator("output_key")
-    @classmethod
-    def validate_output_key(cls, v: str) -> str:
-        valid_keys = [f"F{i}" for i in range(13, 25)]
-        if v not in valid_keys:
-            return "F13"
-        return v
+    def press(self, key_name: str) -> bool:
+        raise NotImplementedError
+    
+    def release(self, key_name: str) -> bool:
+        raise NotImplementedError
+    
+    def warm(self):
+        pass
+    
+    def tap(self, key_name: str, down_up_delay_ms: int = 0) -> bool:
+        if not self.press(key_name):
+            return False
+        if down_up_delay_ms > 0:
+            time.sleep(down_up_delay_ms / 1000.0)
+        return self.release(key_name)
 
-class Profile(BaseModel):
-    profile_id: str
-    profile_name: str
-    description: str = ""
-    icon: str = "default"
-    bindings: dict[str, KeyBinding] = Field(default_factory=dict)
+class PynputBackend(InjectionBackend):
+    
+    name = "pynput"
+    
+    def __init__(self, controller=None):
+        if controller is None:
+            if not load_pynput():
+                raise RuntimeError("pynput is not available")
+            controller = keyboard
+        self.controller = controller
+    
+    def press(self, key_name: str) -> bool:
+        keys = PYNPUT_KEY_MAP[key_name]
+        pressed = 0
+        try:
+            for key in keys:
+                self.controller.press(key)
+                pressed += 1
+        finally:
+            if pressed < len(keys):
+                for key in reversed(keys[:pressed]):
+                    self.controller.release(key)
+        return True
+    
+    def release(self, key_name: str) -> bool:
+        for key in reversed(PYNPUT_KEY_MAP[key_name]):
+            self.controller.release(key)
+        return True
 
-class AppConfig(BaseModel):
-    default_profile_id: str = "default"
-    profiles: list[Profile] = Field(default_factory=list)
+class SendInputBackend(InjectionBackend):
     
-    def get_profile(self, profile_id: str) -> Optional[Profile]:
-        for profile in self.profiles:
-            if profile.profile_id == profile_id:
-                return profile
-        return None
+    name = "sendinput"
     
-    def get_default_profile(self) -> Optional[Profile]:
-        return self.get_profile(self.default_profile_id)
+    def __init__(self, engine: Optional[SendInputEngine] = None):
+        self.engine = engine or SendInputEngine()
+    
+    def press(self, key_name: str) -> bool:
+        return self.engine.press(key_name)
+    
+    def release(self, key_name: str) -> bool:
+        return self.engine.release(key_name)
+    
+    def tap(self, key_name: str, down_up_delay_ms: int = 0) -> bool:
+        return self.engine.tap(key_name, down_up_delay_ms)
 
-EMBEDDED_CONFIG = {
-    "default_profile_id": "default",
-    "profiles": [
-        {
-            "profile_id": "default",
-            "profile_name": "Default",
-            "description": "General shortcuts for Discord + media controls.",
-            "icon": "default",
-            "bindings": {
-                "F13": {
-                    "label": " Mute",
-                    "color_tag": "red",
-                    "output_key": "F13"
-                },
-                "F14": {
-                    "label": "Discord Deafen",
-                    "color_tag": "purple",
-                    "output_key": "F14"
-                },
-                "F15": {
-                    "label": "Media Mute",
-                    "color_tag": "cyan",
-                    "output_key": "F15"
-                },
-                "F16": {
-                    "label": "Vol +",
-                    "color_tag": "cyan",
-                    "output_key": "F16"
-                },
-                "F17": {
-                    "label": "Vol -",
-                    "color_tag": "cyan",
-                    "output_key": "F17"
-                },
-                "F18": {
-                    "label": "Push-To-Talk",
-                    "color_tag": "green",
-                    "output_key": "F18"
-                },
-                "F19": {
-                    "label": "Screenshot",
-                    "color_tag": "orange",
-                    "output_key": "F19"
-                },
-                "F20": {
-                    "label": "OBS Start/Stop",
-                    "color_tag": "red",
-                    "output_key": "F20"
-                },
-                "F21": {
-                    "label": "Scene Next",
-                    "color_tag": "red",
-                    "output_key": "F21"
-                },
-                "F22": {
-                    "label": "Scene Prev",
-                    "color_tag": "red",
-                    "output_key": "F22"
-                },
-                "F23": {
-                    "label": "Browser Focus",
-                    "color_tag": "blue",
-                    "output_key": "F23"
-                },
-                "F24": {
-                    "label": "Gaming Mode",
-                    "color_tag": "yellow",
-                    "output_key": "F24"
-                }
-            }
-        }
-    ]
-}
+class RecordingBackend(InjectionBackend):
+    
+    name = "recording"
+    
+    def __init__(self, max_events: int = 100000):
+        self.events: deque[tuple[float, str, str]] = deque(maxlen=max_events)
+    
+    def press(self, key_name: str) -> bool:
+        self.events.append((time.perf_counter(), "down", key_name))
+        return True
+    
+    def release(self, key_name: str) -> bool:
+        self.events.append((time.perf_counter(), "up", key_name))
+        return True
+    
+    def snapshot(self) -> list[tuple[float, str, str]]:
+        return list(self.events)
+    
+    def clear(self):
+        self.events.clear()
 
-class ConfigManager:
+class AutoBackend(InjectionBackend):
+    
+    name = "auto"
     
     def __init__(self):
-        self.config: Optional[AppConfig] = None
+        self._primary: Optional[InjectionBackend] = None
+        self._resolved = False
     
-    def load(self) -> AppConfig:
-        try:
-            self.config = AppConfig(**EMBEDDED_CONFIG)
-        except Exception:
-            self.config = self._create_default_config()
-        
-        return self.config
+    @property
+    def primary(self) -> Optional[InjectionBackend]:
+        if not self._resolved:
+            self._primary = PynputBackend() if load_pynput() else None
+            self._resolved = True
+        return self._primary
     
-    def save(self) -> bool:
-        return True
+    def warm(self):
+        self.primary
     
-    def _create_default_config(self) -> AppConfig:
-        return AppConfig(**EMBEDDED_CONFIG)
+    def _atomic_engine(self, key_name: str) -> Optional[SendInputEngine]:
+        return get_send_input_engine() if CHORDS[key_name][0] else None
+    
+    def press(self, key_name: str) -> bool:
+        engine = self._atomic_engine(key_name)
+        if engine is not None:
+            metrics.count("sendinput_atomic")
+            return engine.press(key_name)
+        if self.primary is not None:
+            try:
+                result = self.primary.press(key_name)
+                metrics.count("pynput")
+                return result
+            except Exception:
+                metrics.count("pynput_error")
+        engine = get_send_input_engine()
+        metrics.count("sendinput_fallback" if engine is not None else "unavailable")
+        return engine is not None and engine.press(key_name)
+    
+    def release(self, key_name: str) -> bool:
+        engine = self._atomic_engine(key_name)
+        if engine is not None:
+            metrics.count("sendinput_atomic")
+            return engine.release(key_name)
+        if self.primary is not None:
+            try:
+                result = self.primary.release(key_name)
+                metrics.count("pynput")
+                return result
+            except Exception:
+                metrics.count("pynput_error")
+        engine = get_send_input_engine()
+        metrics.count("sendinput_fallback" if engine is not None else "unavailable")
+        return engine is not None and engine.release(key_name)
+    
+    def tap(self, key_name: str, down_up_delay_ms: int = 0) -> bool:
+        engine = self._atomic_engine(key_name)
+        if engine is not None:
+            metrics.count("sendinput_atomic")
+            return engine.tap(key_name, down_up_delay_ms)
+        if self.primary is not None:
+            try:
+                result = self.primary.tap(key_name, down_up_delay_ms)
+                metrics.count("pynput")
+                return result
+            except Exception:
+                metrics.count("pynput_error")
+        metrics.count("sendinput_fallback" if get_send_input_engine() is not None else "unavailable")
+        return _send_input_fallback(key_name, down_up_delay_ms)
 
-COLORS = {
-    "bg_primary": "#1e1e1e",
-    "bg_secondary": "#252525",
-    "bg_tertiary": "#2d2d2d",
-    "text_primary": "#ffffff",
-    "text_secondary": "#b0b0b0",
-    "accent_cyan": "#00d4ff",
-    "accent_purple": "#9d4edd",
-    "accent_green": "#06d6a0",
-    "accent_orange": "#ff9e00",
-    "accent_red": "#ef476f",
-    "accent_blue": "#118ab2",
-    "accent_yellow": "#ffd60a",
-    "accent_gray": "#6c757d",
-    "border": "#3a3a3a",
-    "hover": "#353535",
+BACKENDS = {
+    "auto": AutoBackend,
+    "pynput": PynputBackend,
+    "sendinput": SendInputBackend,
+    "recording": RecordingBackend,
 }
 
-def get_color_for_tag(tag: str) -> str:
-    color_map = {
-        "purple": COLORS["accent_purple"],
-        "cyan": COLORS["accent_cyan"],
-        "green": COLORS["accent_green"],
-        "orange": COLORS["accent_orange"],
-        "red": COLORS["accent_red"],
-        "blue": COLORS["accent_blue"],
-        "yellow": COLORS["accent_yellow"],
-        "gray": COLORS["accent_gray"],
-    }
-    return color_map.get(tag, COLORS["accent_gray"])
+_backend: Optional[InjectionBackend] = None
+
+def select_backend(name: str) -> InjectionBackend:
+    global _backend
+    name = name.lower().strip()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown injection backend: {name} (choose from {', '.join(BACKENDS)})")
+    _backend = BACKENDS[name]()
+    return _backend
+
+def set_backend(backend: InjectionBackend) -> InjectionBackend:
+    global _backend
+    _backend = backend
+    return _backend
+
+def get_backend() -> InjectionBackend:
+    if _backend is None:
+        return select_backend(os.environ.get("STACK_PAD_BACKEND", "auto"))
+    return _backend
 
-class KeyButton(QPushButton):
+HISTOGRAM_BOUNDS_MS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 1000.0)
+
+class MetricBuffer:
     
-    clicked_signal = Signal(str)
+    def __init__(self, size: int = 2048):
+        self.size = size
+        self.samples = array("d", bytes(8 * size))
+        self.count = 0
     
-    def __init__(self, key_name: str, binding: KeyBinding, parent=None):
-        super().__init__(parent)
-        self.key_name = key_name
-        self.binding = binding
-        self.output_key = binding.output_key
-        
-        self.setMinimumSize(90, 50)
-        self.setMaximumSize(90, 50)
-        self.setCursor(QCursor(Qt.PointingHandCursor))
-        
-        self.update_display()
-        self.clicked.connect(lambda: self.clicked_signal.emit(self.output_key))
+    def __len__(self) -> int:
+        return min(self.count, self.size)
     
-    def update_display(self):
-        label = self.binding.label if self.binding.label else self.key_name
-        color = get_color_for_tag(self.binding.color_tag)
-        
-        style = f"""
-        QPushButton {{
-            background-color: {COLORS["bg_secondary"]};
-            border: 2px solid {color};
-            border-radius: 8px;
-            color: {COLORS["text_primary"]};
-            font-size: 10px;
-            font-weight: 500;
-            padding: 4px;
-        }}
-        QPushButton:hover {{
-            background-color: {COLORS["hover"]};
-            border-color: {color};
-        }}
-        QPushButton:pressed {{
-            background-color: {color};
-            color: {COLORS["bg_primary"]};
-        }}
-        """
-        self.setStyleSheet(style)
-        self.setText(label)
-        self.setToolTip(f"{self.key_name} → {self.output_key}\n{label}")
-    
-    def update_binding(self, binding: KeyBinding):
-        self.binding = binding
-        self.output_key = binding.output_key
-        self.update_display()
-
-class EditKeyDialog(QDialog):
-    
-    def __init__(self, key_name: str, binding: KeyBinding, parent=None):
-        super().__init__(parent)
-        self.key_name = key_name
-        self.binding = binding
-        
-        self.setWindowTitle(f"Edit {key_name}")
-        self.setMinimumWidth(300)
-        self.setStyleSheet(f"""
-            QDialog {{
-                background-color: {COLORS["bg_primary"]};
-                color: {COLORS["text_primary"]};
-            }}
-            QLabel {{
-                color: {COLORS["text_primary"]};
-            }}
-            QLineEdit, QComboBox {{
-                background-color: {COLORS["bg_secondary"]};
-                border: 1px solid {COLORS["border"]};
-                border-radius: 4px;
-                padding: 6px;
-                color: {COLORS["text_primary"]};
-            }}
-            QLineEdit:focus, QComboBox:focus {{
-                border-color: {COLORS["accent_cyan"]};
-            }}
-        """)
-        
-        layout = QFormLayout(self)
-        
-        self.key_label = QLabel(f"Key: {key_name} → {binding.output_key}")
-        layout.addRow("", self.key_label)
-        
-        self.label_input = QLineEdit(binding.label)
-        self.label_input.setMaxLength(18)
-        layout.addRow("Label:", self.label_input)
-        
-        color_layout = QHBoxLayout()
-        self.color_combo = QComboBox()
-        self.color_combo.setMinimumWidth(200)
-        color_layout.addWidget(self.color_combo)
-        
-        layout.addRow("Color:", color_layout)
-        self.populate_color_combo()
-        
-        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
-        buttons.accepted.connect(self.accept)
-        buttons.rejected.connect(self.reject)
-        layout.addRow(buttons)
-    
-    def populate_color_combo(self):
-        self.color_combo.clear()
-        default_colors = [
-            ("purple", "#9d4edd"),
-            ("cyan", "#00d4ff"),
-            ("green", "#06d6a0"),
-            ("orange", "#ff9e00"),
-            ("red", "#ef476f"),
-            ("blue", "#118ab2"),
-            ("yellow", "#ffd60a"),
-            ("gray", "#6c757d"),
-        ]
-        
-        for name, color in default_colors:
-            self.add_color_item(name, color)
-        
-        current_tag = self.binding.color_tag
-        for i in range(self.color_combo.count()):
-            if self.color_combo.itemData(i) == current_tag:
-                self.color_combo.setCurrentIndex(i)
-                break
+    def record(self, value: float):
+        self.samples[self.count % self.size] = value
+        self.count += 1
     
-    def add_color_item(self, tag: str, color: str):
-        pixmap = QPixmap(20, 20)
-        pixmap.fill(QColor(color))
-        icon = QIcon(pixmap)
-        self.color_combo.addItem(icon, tag, tag)
-    
-    def get_binding(self) -> KeyBinding:
-        return KeyBinding(
-            label=self.label_input.text(),
-            color_tag=self.color_combo.currentData() or self.color_combo.currentText(),
-            output_key=self.binding.output_key
-        )
-
-class RepeatKeyDialog(QDialog):
+    def values(self) -> list[float]:
+        if self.count <= self.size:
+            return self.samples[:self.count].tolist()
+        start = self.count % self.size
+        return (self.samples[start:] + self.samples[:start]).tolist()
     
-    def __init__(self, current_interval_ms: int = 1000, parent=None):
-        super().__init__(parent)
-        self.selected_key = None
-        self.interval_ms = current_interval_ms
-        
-        self.setWindowTitle("Auto Repeat Settings")
-        self.setMinimumWidth(350)
-        self.setMinimumHeight(450)
-        self.setStyleSheet(f"""
-            QDialog {{
-                background-color: {COLORS["bg_primary"]};
-                color: {COLORS["text_primary"]};
-            }}
-            QLabel {{
-                color: {COLORS["text_primary"]};
-            }}
-            QPushButton {{
-                background-color: {COLORS["bg_secondary"]};
-                border: 1px solid {COLORS["border"]};
-                border-radius: 4px;
-                padding: 8px;
-                color: {COLORS["text_primary"]};
-                min-width: 60px;
-            }}
-            QPushButton:hover {{
-                background-color: {COLORS["hover"]};
-                border-color: {COLORS["accent_cyan"]};
-            }}
-            QLineEdit, QComboBox {{
-                background-color: {COLORS["bg_secondary"]};
-                border: 1px solid {COLORS["border"]};
-                border-radius: 4px;
-                padding: 6px;
-                color: {COLORS["text_primary"]};
-            }}
-            QLineEdit:focus, QComboBox:focus {{
-                border-color: {COLORS["accent_cyan"]};
-            }}
-        """)
-        
-        layout = QVBoxLayout(self)
-        
-        key_label = QLabel("Select Key to Repeat:")
-        key_label.setStyleSheet("font-size: 12px; font-weight: bold;")
-        layout.addWidget(key_label)
-        
-        grid = QGridLayout()
-        grid.setSpacing(5)
-        
-        f_keys = get_f_key_list()
-        for idx, key_name in enumerate(f_keys):
-            row = idx // 3
-            col = idx % 3
-            btn = QPushButton(key_name)
-            btn.clicked.connect(lambda checked, k=key_name: self.select_key(k))
-            grid.addWidget(btn, row, col)
-        
-        layout.addLayout(grid)
-        
-        self.selected_key_label = QLabel("Selected: None")
-        self.selected_key_label.setStyleSheet("font-size: 11px; color: " + COLORS["accent_cyan"] + ";")
-        layout.addWidget(self.selected_key_label)
-        
-        layout.addSpacing(10)
-        
-        speed_label = QLabel("Repeat Speed:")
-        speed_label.setStyleSheet("font-size: 12px; font-weight: bold;")
-        layout.addWidget(speed_label)
-        
-        unit_layout = QHBoxLayout()
-        unit_layout.addWidget(QLabel("Unit:"))
-        self.unit_combo = QComboBox()
-        self.unit_combo.addItems(["Milliseconds", "Seconds", "Minutes", "Hours"])
-        self.unit_combo.setCurrentText("Seconds")
-        self.unit_combo.currentTextChanged.connect(self.update_interval)
-        unit_layout.addWidget(self.unit_combo)
-        layout.addLayout(unit_layout)
-        
-        value_layout = QHBoxLayout()
-        value_layout.addWidget(QLabel("Value:"))
-        self.value_input = QLineEdit("1.0")
-        self.value_input.setPlaceholderText("Enter value")
-        self.value_input.textChanged.connect(self.update_interval)
-        value_layout.addWidget(self.value_input)
-        layout.addLayout(value_layout)
-        
-        preset_label = QLabel("Presets:")
-        layout.addWidget(preset_label)
-        preset_layout = QHBoxLayout()
-        
-        turbo_btn = QPushButton("Turbo")
-        turbo_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {COLORS["accent_red"]};
-                font-weight: bold;
-            }}
-        """)
-        turbo_btn.clicked.connect(lambda: self.set_preset("0.001", "Seconds"))
-        preset_layout.addWidget(turbo_btn)
-        
-        for label, value, unit in [("Fast", "0.1", "Seconds"), ("Normal", "1", "Seconds"), ("Slow", "5", "Seconds")]:
-            btn = QPushButton(label)
-            btn.clicked.connect(lambda checked, v=value, u=unit: self.set_preset(v, u))
-            preset_layout.addWidget(btn)
-        
-        layout.addLayout(preset_layout)
-        
-        self.interval_label = QLabel()
-        self.interval_label.setStyleSheet("font-size: 10px; color: " + COLORS["text_secondary"] + ";")
-        self.update_interval()
-        layout.addWidget(self.interval_label)
-        
-        layout.addStretch()
-        
-        btn_layout = QHBoxLayout()
-        btn_layout.addStretch()
-        
-        ok_btn = QPushButton("OK")
-        ok_btn.clicked.connect(self.accept_dialog)
-        btn_layout.addWidget(ok_btn)
-        
-        cancel_btn = QPushButton("Cancel")
-        cancel_btn.clicked.connect(self.reject)
-        btn_layout.addWidget(cancel_btn)
-        
-        layout.addLayout(btn_layout)
+    def clear(self):
+        self.count = 0
     
-    def select_key(self, key_name: str):
-        self.selected_key = key_name
-        self.selected_key_label.setText(f"Selected: {key_name}")
-        self.selected_key_label.setStyleSheet("font-size: 11px; color: " + COLORS["accent_green"] + ";")
+    def percentile(self, percentile: float) -> float:
+        ordered = sorted(self.samples[:len(self)])
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(percentile * len(ordered)))]
     
-    def set_preset(self, value: str, unit: str):
-        self.value_input.setText(value)
-        self.unit_combo.setCurrentText(unit)
+    def percentile_ms(self, percentile: float) -> float:
+        return self.percentile(percentile) * 1000.0
     
-    def update_interval(self):
-        try:
-            value = float(self.value_input.text() or "1.0")
-            unit = self.unit_combo.currentText()
-            
-            if unit == "Milliseconds":
-                interval_ms = int(value)
-            elif unit == "Seconds":
-                interval_ms = int(value * 1000)
-            elif unit == "Minutes":
-                interval_ms = int(value * 60 * 1000)
-            elif unit == "Hours":
-                interval_ms = int(value * 60 * 60 * 1000)
-            else:
-                interval_ms = 1000
-            
-            interval_ms = max(1, min(interval_ms, 216000000))
-            
-            self.interval_ms = interval_ms
-            
-            if interval_ms < 1000:
-                self.interval_label.setText(f"Interval: {interval_ms} ms")
-            elif interval_ms < 60000:
-                self.interval_label.setText(f"Interval: {interval_ms/1000:.3f} seconds")
-            elif interval_ms < 3600000:
-                self.interval_label.setText(f"Interval: {interval_ms/60000:.2f} minutes")
-            else:
-                self.interval_label.setText(f"Interval: {interval_ms/3600000:.2f} hours")
-        except ValueError:
-            self.interval_label.setText("Invalid value")
+    def mean_ms(self) -> float:
+        window = len(self)
+        return sum(self.samples[:window]) / window * 1000.0 if window else 0.0
     
-    def accept_dialog(self):
-        if self.selected_key:
-            self.accept()
-        else:
-            QMessageBox.warning(self, "No Key Selected", "Please select a key to repeat.")
+    def max_ms(self) -> float:
+        return max(self.samples[:len(self)], default=0.0) * 1000.0
     
-    def get_interval_ms(self) -> int:
-        return self.interval_ms
+    def histogram_ms(self, bounds: tuple[float, ...] = HISTOGRAM_BOUNDS_MS) -> list[int]:
+        counts = [0] * (len(bounds) + 1)
+        for value in self.samples[:len(self)]:
+            counts[bisect.bisect_left(bounds, value * 1000.0)] += 1
+        return counts
+    
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "window": len(self),
+            "mean_ms": self.mean_ms(),
+            "p50_ms": self.percentile_ms(0.5),
+            "p90_ms": self.percentile_ms(0.9),
+            "p99_ms": self.percentile_ms(0.99),
+            "max_ms": self.max_ms(),
+            "histogram_ms": {"bounds": list(HISTOGRAM_BOUNDS_MS), "counts": self.histogram_ms()},
+        }
 
-class MainWindow(QMainWindow):
+class LatencyStats(MetricBuffer):
     
-    def __init__(self):
-        super().__init__()
-        self.config_manager = ConfigManager()
-        self.config = self.config_manager.load()
-        self.current_profile: Optional[Profile] = self.config.get_default_profile()
-        self.edit_mode = False
-        self.position_locked = False
-        self.old_pos = None
-        self.is_minimized = False
-        
-        self.global_repeat_timer = None
-        self.current_repeat_key = None
-        
-        self.minimize_button = None
-        
-        self.repeat_interval_ms = 1000
-        
-        self.init_ui()
-        self.init_tray()
-        self.load_profile(self.config.default_profile_id)
-    
-    def init_ui(self):
-        self.setWindowTitle("STACK-PAD v2.7.0")
-        self.setWindowFlags(
-            Qt.WindowStaysOnTopHint |
-            Qt.FramelessWindowHint |
-            Qt.Tool
+    def summary(self) -> str:
+        return (
+            f"Triggers: {self.count}\n"
+            f"Trigger → inject p50: {self.percentile_ms(0.5):.3f} ms\n"
+            f"Trigger → inject p99: {self.percentile_ms(0.99):.3f} ms\n"
+            f"Trigger → inject max: {self.max_ms():.3f} ms"
         )
-        self.setAttribute(Qt.WA_TranslucentBackground, False)
-        
-        self.setFixedSize(320, 340)
-        self.position_bottom_right()
-        
-        main_widget = QWidget()
-        self.setCentralWidget(main_widget)
-        main_layout = QVBoxLayout(main_widget)
-        main_layout.setContentsMargins(10, 10, 10, 10)
-        main_layout.setSpacing(8)
-        
-        self.setStyleSheet(f"""
-            QMainWindow {{
-                background-color: {COLORS["bg_primary"]};
-            }}
-            QWidget {{
-                background-color: {COLORS["bg_primary"]};
-                color: {COLORS["text_primary"]};
-            }}
-        """)
-        
-        self.top_bar = self.create_top_bar()
-        main_layout.addWidget(self.top_bar)
-        
-        self.key_grid = self.create_key_grid()
-        main_layout.addWidget(self.key_grid)
-        
-        self.bottom_bar = self.create_bottom_bar()
-        main_layout.addWidget(self.bottom_bar)
-    
-    def create_top_bar(self) -> QWidget:
-        bar = QWidget()
-        layout = QHBoxLayout(bar)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(8)
-        
-        left_layout = QVBoxLayout()
-        left_layout.setSpacing(2)
-        
-        title_label = QLabel("STACK-PAD")
-        title_label.setStyleSheet(f"""
-            font-size: 12px;
-            font-weight: bold;
-            color: {COLORS["accent_cyan"]};
-        """)
-        left_layout.addWidget(title_label)
-        
-        version_copyright_layout = QHBoxLayout()
-        version_copyright_layout.setSpacing(5)
-        
-        version_label = QLabel("v2.7.0")
-        version_label.setStyleSheet(f"""
-            font-size: 9px;
-            color: {COLORS["text_secondary"]};
-        """)
-        version_copyright_layout.addWidget(version_label)
-        
-        copyright_label = QLabel("Dev.Essam / GitHub ( s0-5 ) © 2026")
-        copyright_label.setStyleSheet(f"""
-            font-size: 8px;
-            color: {COLORS["text_secondary"]};
-        """)
-        version_copyright_layout.addWidget(copyright_label)
-        version_copyright_layout.addStretch()
-        
-        left_layout.addLayout(version_copyright_layout)
-        layout.addLayout(left_layout)
-        
-        layout.addStretch()
-        
-        self.lock_btn = QPushButton("🔒")
-        self.lock_btn.setFixedSize(30, 30)
-        self.lock_btn.setToolTip("Lock/Unlock Position")
-        self.lock_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {COLORS["bg_secondary"]};
-                border: 1px solid {COLORS["border"]};
-                border-radius: 4px;
-            }}
-            QPushButton:hover {{
-                background-color: {COLORS["hover"]};
-            }}
-        """)
-        self.lock_btn.clicked.connect(self.toggle_lock)
-        layout.addWidget(self.lock_btn)
+
+METRIC_LABELS = {
+    "click_to_inject": "Click → inject start",
+    "inject_to_release": "Inject start → release",
+    "trigger_to_inject": "Hotkey → inject start",
+    "repeat_jitter": "Repeat period jitter",
+}
+
+class Metrics:
+    
+    def __init__(self, size: int = 4096):
+        self.buffers: dict[str, MetricBuffer] = {
+            "click_to_inject": MetricBuffer(size),
+            "inject_to_release": MetricBuffer(size),
+            "trigger_to_inject": LatencyStats(size),
+            "repeat_jitter": MetricBuffer(size),
+        }
+        self.counters: dict[str, int] = {}
+    
+    def record(self, name: str, seconds: float):
+        self.buffers[name].record(seconds)
+    
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def reset(self):
+        for buffer in self.buffers.values():
+            buffer.clear()
+        self.counters.clear()
+    
+    def to_dict(self) -> dict:
+        return {
+            "captured_at": time.time(),
+            "buffers": {name: buffer.to_dict() for name, buffer in self.buffers.items()},
+            "counters": dict(self.counters),
+        }
+    
+    def export_json(self, path: Path):
+        _atomic_write(Path(path), json.dumps(self.to_dict(), indent=2))
+    
+    def report(self) -> str:
+        lines = [f"{'':<24} {'n':>7} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}  (ms)"]
+        for name, buffer in self.buffers.items():
+            lines.append(
+                f"{METRIC_LABELS.get(name, name):<24} {buffer.count:>7} "
+                f"{buffer.percentile_ms(0.5):>9.3f} {buffer.percentile_ms(0.9):>9.3f} "
+                f"{buffer.percentile_ms(0.99):>9.3f} {buffer.max_ms():>9.3f}"
+            )
+        lines.append("")
+        lines.append("Injection paths:")
+        if not self.counters:
+            lines.append("  (none yet)")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"  {name:<22} {value:>7}")
+        return "\n".join(lines)
+
+metrics = Metrics()
+
+class TokenBucket:
+    
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+    
+    def __init__(self, rate: float, capacity: float, now: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.perf_counter() if now is None else now
+    
+    def refill(self, now: float) -> float:
+        tokens = self.tokens + (now - self.updated) * self.rate
+        self.tokens = tokens if tokens < self.capacity else self.capacity
+        self.updated = now
+        return self.tokens
+
+class RateLimiter:
+    
+    GLOBAL = "*"
+    
+    def __init__(self, limits: dict[str, "RateLimit"]):
+        now = time.perf_counter()
+        self.buckets: dict[str, TokenBucket] = {
+            key_name: TokenBucket(limit.rate_per_s, limit.burst, now) for key_name, limit in limits.items()
+        }
+        self.global_bucket = self.buckets.pop(self.GLOBAL, None)
+    
+    def exceeds_burst(self, presses: tuple[tuple[str, int], ...]) -> Optional[str]:
+        total = 0
+        for key_name, count in presses:
+            bucket = self.buckets.get(key_name)
+            if bucket is not None and count > bucket.capacity:
+                return key_name
+            total += count
+        if self.global_bucket is not None and total > self.global_bucket.capacity:
+            return self.GLOBAL
+        return None
+    
+    def blocked_by(self, presses: tuple[tuple[str, int], ...], now: float) -> Optional[str]:
+        buckets = self.buckets
+        total = 0
+        for key_name, count in presses:
+            bucket = buckets.get(key_name)
+            if bucket is not None and bucket.refill(now) < count:
+                return key_name
+            total += count
+        global_bucket = self.global_bucket
+        if global_bucket is not None:
+            if global_bucket.refill(now) < total:
+                return self.GLOBAL
+            global_bucket.tokens -= total
+        for key_name, count in presses:
+            bucket = buckets.get(key_name)
+            if bucket is not None:
+                bucket.tokens -= count
+        return None
+
+class InjectionDispatcher:
+    
+    def __init__(self, send=None, stats: Optional[Metrics] = None,
+                 limiter: Optional[RateLimiter] = None):
+        self._send = send or send_key
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._closed = False
+        self.limiter = limiter
+        self.metrics = stats if stats is not None else metrics
+        self.trigger_latency: LatencyStats = self.metrics.buffers["trigger_to_inject"]
+        self._thread = threading.Thread(target=self._run, name="stackpad-injector", daemon=True)
+        self._thread.start()
+    
+    def submit(self, key_name: str, down_up_delay_ms: int = 25,
+               triggered_at: Optional[float] = None, clicked: bool = False) -> Future:
+        return self._enqueue(self._send, (key_name, down_up_delay_ms), ((key_name, 1),), triggered_at, clicked=clicked)
+    
+    def submit_plan(self, plan: "MacroPlan", triggered_at: Optional[float] = None,
+                    clicked: bool = False) -> Future:
+        return self._enqueue(plan.execute, (), plan.presses, triggered_at, clicked=clicked)
+    
+    def _enqueue(self, call, args: tuple, presses: tuple = (), triggered_at: Optional[float] = None,
+                 measure: bool = True, clicked: bool = False) -> Future:
+        future: Future = Future()
+        if self._closed:
+            future.set_result(False)
+            return future
+        enqueued_at = time.perf_counter() if measure else None
+        self._queue.put((future, call, args, presses, triggered_at, enqueued_at, clicked))
+        return future
+    
+    def flush(self) -> Future:
+        return self._enqueue(lambda: True, (), measure=False)
+    
+    def pending(self) -> int:
+        return self._queue.qsize()
+    
+    def stop(self, timeout: Optional[float] = 1.0):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+    
+    def _run(self):
+        click_to_inject = self.metrics.buffers["click_to_inject"]
+        inject_to_release = self.metrics.buffers["inject_to_release"]
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            future, call, args, presses, triggered_at, enqueued_at, clicked = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            started = time.perf_counter()
+            limiter = self.limiter
+            if presses and limiter is not None:
+                blocked = limiter.blocked_by(presses, started)
+                if blocked is not None:
+                    self.metrics.count("throttled")
+                    self.metrics.count(f"throttled {blocked}")
+                    future.set_result(False)
+                    continue
+            if triggered_at is not None:
+                self.trigger_latency.record(started - triggered_at)
+            elif clicked:
+                click_to_inject.record(started - enqueued_at)
+            try:
+                future.set_result(call(*args))
+            except Exception as exc:
+                future.set_exception(exc)
+            if enqueued_at is not None:
+                inject_to_release.record(time.perf_counter() - started)
+
+class _HighResolutionTimer:
+    
+    def __enter__(self):
+        self._winmm = None
+        if sys.platform == "win32":
+            try:
+                self._winmm = ctypes.WinDLL("winmm")
+                self._winmm.timeBeginPeriod(1)
+            except Exception:
+                self._winmm = None
+        return self
+    
+    def __exit__(self, *exc):
+        if self._winmm is not None:
+            self._winmm.timeEndPeriod(1)
+        return False
+
+SPIN_THRESHOLD_S = 0.002
+
+def sleep_until(deadline: float, clock=time.perf_counter):
+    remaining = deadline - clock()
+    if remaining > SPIN_THRESHOLD_S:
+        time.sleep(remaining - SPIN_THRESHOLD_S)
+    while clock() < deadline:
+        time.sleep(0)
+
+class RepeatStats:
+    
+    def __init__(self, interval_ms: float, window: int = 2048):
+        self.interval_ms = interval_ms
+        self.ticks = 0
+        self.presses = 0
+        self.first_presses = 0
+        self.first_tick: Optional[float] = None
+        self.last_tick: Optional[float] = None
+        self.periods = MetricBuffer(window)
+        self.lateness = MetricBuffer(window)
+    
+    def record(self, now: float, lateness: float, presses: int = 1):
+        if self.last_tick is not None:
+            period = now - self.last_tick
+            self.periods.record(period)
+            metrics.record("repeat_jitter", abs(period - self.interval_ms / 1000.0))
+        else:
+            self.first_tick = now
+            self.first_presses = presses
+        self.last_tick = now
+        self.lateness.record(lateness)
+        self.ticks += 1
+        self.presses += presses
+    
+    def achieved_rate_hz(self) -> float:
+        if self.ticks < 2 or self.last_tick == self.first_tick:
+            return 0.0
+        return (self.presses - self.first_presses) / (self.last_tick - self.first_tick)
+    
+    def target_rate_hz(self) -> float:
+        return 1000.0 / self.interval_ms
+    
+    def jitter_ms(self, percentile: float = 0.99) -> float:
+        if not self.periods:
+            return 0.0
+        target = self.interval_ms / 1000.0
+        deviations = sorted(abs(period - target) for period in self.periods.values())
+        index = min(len(deviations) - 1, int(percentile * len(deviations)))
+        return deviations[index] * 1000.0
+    
+    def is_attainable(self) -> bool:
+        if self.ticks < 10:
+            return True
+        return self.achieved_rate_hz() >= 0.9 * self.target_rate_hz()
+    
+    def summary(self) -> str:
+        text = (
+            f"Target: {self.target_rate_hz():.2f}/s ({self.interval_ms} ms)\n"
+            f"Achieved: {self.achieved_rate_hz():.2f}/s over {self.presses} presses\n"
+            f"Jitter (p99): {self.jitter_ms():.2f} ms"
+        )
+        if not self.is_attainable():
+            text += "\nTarget rate is not attainable with the current injection cost"
+        return text
+
+OVERRUN_POLICIES = ("skip", "coalesce", "burst")
+
+class RepeatJob:
+    
+    DEFAULT_BURST_CAP = 4
+    
+    def __init__(self, job_id: int, key_name: str, interval_ms: int,
+                 max_count: Optional[int] = None, max_duration_s: Optional[float] = None,
+                 overrun_policy: str = "skip", burst_cap: int = DEFAULT_BURST_CAP):
+        if overrun_policy not in OVERRUN_POLICIES:
+            raise ValueError(f"Unknown overrun policy: {overrun_policy}")
+        self.job_id = job_id
+        self.key_name = key_name
+        self.interval_ms = interval_ms
+        self.max_count = max_count
+        self.max_duration_s = max_duration_s
+        self.overrun_policy = overrun_policy
+        self.burst_cap = max(1, burst_cap)
+        self.state = "running"
+        self.count = 0
+        self.pending = 0
+        self.rejected = 0
+        self.owed = 0
+        self.catch_up_armed = False
+        self.dropped = 0
+        self.coalesced = 0
+        self.active_time = 0.0
+        self.resumed_at = 0.0
+        self.deadline = 0.0
+        self.generation = 0
+        self.in_flight: Optional[Future] = None
+        self.stats = RepeatStats(interval_ms)
+    
+    def elapsed(self, now: float) -> float:
+        if self.state == "running":
+            return self.active_time + (now - self.resumed_at)
+        return self.active_time
+    
+    def describe(self) -> str:
+        count = f"{self.count}/{self.max_count}" if self.max_count else str(self.count)
+        text = f"#{self.job_id} {self.key_name} · {self.interval_ms} ms · {count}"
+        if self.state != "running":
+            text += f" ({self.state})"
+        return text
+    
+    def overrun_summary(self) -> str:
+        return (
+            f"Overrun policy: {self.overrun_policy}"
+            + (f" (cap {self.burst_cap})" if self.overrun_policy == "burst" else "")
+            + f"\nDropped ticks: {self.dropped}\nCoalesced ticks: {self.coalesced}"
+            + f"\nRejected presses: {self.rejected}"
+        )
+
+class RepeatJobManager:
+    
+    SPIN_THRESHOLD_S = SPIN_THRESHOLD_S
+    
+    def __init__(self, fire, on_change=None, clock=time.perf_counter):
+        self.fire = fire
+        self.on_change = on_change
+        self.clock = clock
+        self._jobs: dict[int, RepeatJob] = {}
+        self._heap: list[tuple[float, int, int, bool, RepeatJob]] = []
+        self._seq = itertools.count()
+        self._next_id = itertools.count(1)
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+    
+    def add_job(self, key_name: str, interval_ms: int, max_count: Optional[int] = None,
+                max_duration_s: Optional[float] = None, overrun_policy: str = "skip",
+                burst_cap: int = RepeatJob.DEFAULT_BURST_CAP) -> RepeatJob:
+        with self._cond:
+            job = RepeatJob(
+                next(self._next_id), key_name, interval_ms, max_count, max_duration_s,
+                overrun_policy, burst_cap,
+            )
+            now = self.clock()
+            job.resumed_at = now
+            job.deadline = now + interval_ms / 1000.0
+            self._jobs[job.job_id] = job
+            self._push(job)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="stackpad-repeat", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        self._notify_change()
+        return job
+    
+    def get(self, job_id: int) -> Optional[RepeatJob]:
+        return self._jobs.get(job_id)
+    
+    def jobs(self) -> list[RepeatJob]:
+        with self._cond:
+            return sorted(self._jobs.values(), key=lambda job: job.job_id)
+    
+    def active_count(self) -> int:
+        return sum(1 for job in self.jobs() if job.state == "running")
+    
+    def pause(self, job_id: int) -> bool:
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.state != "running":
+                return False
+            job.active_time += self.clock() - job.resumed_at
+            job.state = "paused"
+            job.generation += 1
+        self._notify_change()
+        return True
+    
+    def resume(self, job_id: int) -> bool:
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.state != "paused":
+                return False
+            now = self.clock()
+            job.resumed_at = now
+            job.deadline = now + job.interval_ms / 1000.0
+            job.state = "running"
+            job.owed = 0
+            self._push(job)
+            self._cond.notify()
+        self._notify_change()
+        return True
+    
+    def stop(self, job_id: int) -> bool:
+        with self._cond:
+            job = self._jobs.pop(job_id, None)
+            if job is None:
+                return False
+            job.state = "stopped"
+            job.generation += 1
+        self._notify_change()
+        return True
+    
+    def stop_all(self):
+        with self._cond:
+            for job in self._jobs.values():
+                job.state = "stopped"
+                job.generation += 1
+            self._jobs.clear()
+            self._heap.clear()
+        self._notify_change()
+    
+    def shutdown(self, timeout: Optional[float] = 1.0):
+        self.stop_all()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+    
+    def _push(self, job: RepeatJob, catch_up: bool = False):
+        deadline = self.clock() if catch_up else job.deadline
+        heapq.heappush(self._heap, (deadline, next(self._seq), job.generation, catch_up, job))
+    
+    def _catch_up(self, job: RepeatJob, generation: int):
+        with self._cond:
+            job.catch_up_armed = False
+            if job.generation == generation and job.owed > 0:
+                self._push(job, catch_up=True)
+                self._cond.notify()
+    
+    def _notify_change(self):
+        if self.on_change is not None:
+            self.on_change()
+    
+    def _next_due(self) -> Optional[tuple[RepeatJob, int, float, bool, bool]]:
+        while not self._closed:
+            if not self._heap:
+                self._cond.wait()
+                continue
+            deadline, _, generation, catch_up, job = self._heap[0]
+            if generation != job.generation:
+                heapq.heappop(self._heap)
+                continue
+            remaining = deadline - self.clock()
+            if remaining > self.SPIN_THRESHOLD_S:
+                self._cond.wait(remaining - self.SPIN_THRESHOLD_S)
+                continue
+            if remaining > 0:
+                return job, generation, deadline, catch_up, False
+            heapq.heappop(self._heap)
+            return job, generation, deadline, catch_up, True
+        return None
+    
+    def _run(self):
+        with _HighResolutionTimer():
+            while True:
+                with self._cond:
+                    due = self._next_due()
+                if due is None:
+                    return
+                job, generation, deadline, catch_up, ready = due
+                if not ready:
+                    while self.clock() < deadline:
+                        time.sleep(0)
+                    continue
+                try:
+                    self._tick(job, generation, deadline, catch_up)
+                except Exception:
+                    log.exception("Repeat job #%s (%s) failed and was stopped", job.job_id, job.key_name)
+                    self._fail(job)
+    
+    def _fail(self, job: RepeatJob):
+        with self._cond:
+            job.state = "failed"
+            job.generation += 1
+            self._jobs.pop(job.job_id, None)
+        self._notify_change()
+    
+    def _tick(self, job: RepeatJob, generation: int, deadline: float, catch_up: bool):
+        with self._cond:
+            if job.generation != generation:
+                return
+            now = self.clock()
+            if job.max_duration_s is not None and job.elapsed(now) >= job.max_duration_s:
+                finished = True
+            else:
+                if not catch_up:
+                    interval = job.interval_ms / 1000.0
+                    missed = int((now - deadline) // interval) if now > deadline else 0
+                    job.owed += 1 + missed
+                    job.deadline = deadline + (missed + 1) * interval
+                    self._push(job)
+                finished = self._settle(job, generation, now, deadline)
+            
+            if finished:
+                job.active_time = job.elapsed(now)
+                job.state = "finished"
+                job.generation += 1
+                self._jobs.pop(job.job_id, None)
+        if finished:
+            self._notify_change()
+    
+    def _delivered(self, job: RepeatJob, generation: int, future: Future):
+        delivered = not future.cancelled() and future.exception() is None and future.result() is not False
+        with self._cond:
+            job.pending -= 1
+            if delivered:
+                job.count += 1
+            else:
+                job.rejected += 1
+            if job.generation == generation and job.max_count is not None and job.count >= job.max_count:
+                self._push(job, catch_up=True)
+                self._cond.notify()
+    
+    def _settle(self, job: RepeatJob, generation: int, now: float, deadline: float) -> bool:
+        if job.owed == 0:
+            return job.max_count is not None and job.count >= job.max_count
+        busy = job.in_flight is not None and not job.in_flight.done()
+        
+        if job.overrun_policy == "skip":
+            presses = 0 if busy else 1
+            job.dropped += job.owed - presses
+            job.owed = 0
+        elif job.overrun_policy == "coalesce":
+            job.coalesced += job.owed - 1
+            job.owed = 1
+            presses = 0 if busy else 1
+        else:
+            if job.owed > job.burst_cap:
+                job.dropped += job.owed - job.burst_cap
+                job.owed = job.burst_cap
+            presses = 0 if busy else job.owed
+        
+        if job.max_count is not None:
+            presses = max(0, min(presses, job.max_count - job.count - job.pending))
+        
+        if presses > 0:
+            result = None
+            for _ in range(presses):
+                result = self.fire(job)
+                if isinstance(result, Future):
+                    job.pending += 1
+                    result.add_done_callback(lambda future: self._delivered(job, generation, future))
+                elif result is False:
+                    job.rejected += 1
+                else:
+                    job.count += 1
+            job.in_flight = result if isinstance(result, Future) else None
+            job.owed = max(0, job.owed - presses)
+            job.stats.record(now, now - deadline, presses)
         
-        self.minimize_btn = QPushButton("👁")
-        self.minimize_btn.setFixedSize(30, 30)
-        self.minimize_btn.setToolTip("Hide/Show Application")
-        self.minimize_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {COLORS["bg_secondary"]};
-                border: 1px solid {COLORS["border"]};
-                border-radius: 4px;
-            }}
-            QPushButton:hover {{
-                background-color: {COLORS["hover"]};
-            }}
-        """)
-        self.minimize_btn.clicked.connect(self.toggle_minimize)
-        layout.addWidget(self.minimize_btn)
+        if job.owed and job.in_flight is not None and not job.catch_up_armed:
+            job.catch_up_armed = True
+            job.in_flight.add_done_callback(lambda _future: self._catch_up(job, generation))
         
-        self.close_btn = QPushButton("✕")
-        self.close_btn.setFixedSize(30, 30)
-        self.close_btn.setToolTip("Close Application")
-        self.close_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {COLORS["bg_secondary"]};
-                border: 1px solid {COLORS["border"]};
-                border-radius: 4px;
-                color: {COLORS["accent_red"]};
-            }}
-            QPushButton:hover {{
-                background-color: {COLORS["accent_red"]};
-                color: {COLORS["text_primary"]};
-            }}
-        """)
-        self.close_btn.clicked.connect(self.close_application)
-        layout.addWidget(self.close_btn)
+        return job.max_count is not None and job.count >= job.max_count
+
+class TriggerSource:
+    
+    name = "base"
+    
+    def start(self, emit):
+        raise NotImplementedError
+    
+    def stop(self):
+        pass
+
+class SyntheticTriggerSource(TriggerSource):
+    
+    name = "synthetic"
+    
+    def __init__(self):
+        self.emit = None
+    
+    def start(self, emit):
+        self.emit = emit
+    
+    def stop(self):
+        self.emit = None
+    
+    def fire(self, trigger: str, triggered_at: Optional[float] = None) -> bool:
+        if self.emit is None:
+            return False
+        return self.emit(trigger, time.perf_counter() if triggered_at is None else triggered_at)
+
+def valid_hotkey(hotkey: str) -> bool:
+    try:
+        from pynput.keyboard import HotKey
+    except Exception:
+        return True
+    try:
+        HotKey.parse(hotkey)
+    except ValueError:
+        return False
+    return True
+
+class PynputHotkeySource(TriggerSource):
+    
+    name = "pynput"
+    
+    def __init__(self, hotkeys: list[str]):
+        self.hotkeys = list(hotkeys)
+        self._listener = None
+    
+    def start(self, emit):
+        if not load_pynput():
+            raise RuntimeError("pynput is not available")
+        from pynput.keyboard import GlobalHotKeys
+        clock = time.perf_counter
+        self._listener = GlobalHotKeys({
+            hotkey: (lambda hotkey=hotkey: emit(hotkey, clock()))
+            for hotkey in self.hotkeys
+        })
+        self._listener.daemon = True
+        self._listener.start()
+    
+    def stop(self):
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+class TriggerRouter:
+    
+    def __init__(self, dispatcher: InjectionDispatcher, resolve, mapping: Optional[dict[str, str]] = None):
+        self.dispatcher = dispatcher
+        self.resolve = resolve
+        self.mapping: dict[str, str] = dict(mapping or {})
+        self.sources: list[TriggerSource] = []
+        self.unmatched = 0
+    
+    @property
+    def latency(self) -> LatencyStats:
+        return self.dispatcher.trigger_latency
+    
+    def add_source(self, source: TriggerSource) -> TriggerSource:
+        source.start(self.trigger)
+        self.sources.append(source)
+        return source
+    
+    def trigger(self, trigger: str, triggered_at: float) -> bool:
+        slot = self.mapping.get(trigger)
+        binding = self.resolve(slot) if slot is not None else None
+        if binding is None:
+            self.unmatched += 1
+            return False
+        plan = binding.plan
+        if plan is not None:
+            self.dispatcher.submit_plan(plan, triggered_at)
+        else:
+            self.dispatcher.submit(binding.output_key, triggered_at=triggered_at)
+        return True
+    
+    def stop(self):
+        for source in self.sources:
+            source.stop()
+        self.sources.clear()
+
+class ForegroundSource:
+    
+    name = "base"
+    
+    def start(self, emit):
+        raise NotImplementedError
+    
+    def stop(self):
+        pass
+
+class SyntheticForegroundSource(ForegroundSource):
+    
+    name = "synthetic"
+    
+    def __init__(self):
+        self.emit = None
+    
+    def start(self, emit):
+        self.emit = emit
+    
+    def stop(self):
+        self.emit = None
+    
+    def activate(self, app_name: str) -> bool:
+        if self.emit is None:
+            return False
+        return self.emit(app_name)
+
+class WinEventForegroundSource(ForegroundSource):
+    
+    name = "winevent"
+    
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WINEVENT_SKIPOWNPROCESS = 0x0002
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    WM_QUIT = 0x0012
+    APP_CACHE_SIZE = 256
+    
+    def __init__(self):
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id: Optional[int] = None
+        self._apps: dict[int, str] = {}
+    
+    def start(self, emit):
+        if sys.platform != "win32":
+            raise RuntimeError("foreground window events are only available on Windows")
+        self.user32 = ctypes.WinDLL("user32", use_last_error=True)
+        self.kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        self.WinEventProc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD,
+        )
+        self.user32.SetWinEventHook.argtypes = (
+            wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, self.WinEventProc,
+            wintypes.DWORD, wintypes.DWORD, wintypes.DWORD,
+        )
+        self.user32.SetWinEventHook.restype = wintypes.HANDLE
+        self.user32.UnhookWinEvent.argtypes = (wintypes.HANDLE,)
+        self.user32.GetForegroundWindow.restype = wintypes.HWND
+        self.user32.GetWindowThreadProcessId.argtypes = (wintypes.HWND, ctypes.POINTER(wintypes.DWORD))
+        self.kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+        self.kernel32.OpenProcess.restype = wintypes.HANDLE
+        self.kernel32.QueryFullProcessImageNameW.argtypes = (
+            wintypes.HANDLE, wintypes.DWORD, wintypes.LPWSTR, ctypes.POINTER(wintypes.DWORD),
+        )
+        self.kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
         
-        return bar
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(emit, ready), name="stackpad-foreground", daemon=True)
+        self._thread.start()
+        ready.wait(1.0)
+    
+    def _run(self, emit, ready: threading.Event):
+        def on_event(hook, event, hwnd, id_object, id_child, event_thread, event_time):
+            app_name = self.app_name(hwnd)
+            if app_name is not None:
+                emit(app_name)
+        
+        callback = self.WinEventProc(on_event)
+        self._thread_id = self.kernel32.GetCurrentThreadId()
+        hook = self.user32.SetWinEventHook(
+            self.EVENT_SYSTEM_FOREGROUND, self.EVENT_SYSTEM_FOREGROUND, None, callback,
+            0, 0, self.WINEVENT_OUTOFCONTEXT | self.WINEVENT_SKIPOWNPROCESS,
+        )
+        ready.set()
+        if not hook:
+            return
+        try:
+            app_name = self.app_name(self.user32.GetForegroundWindow())
+            if app_name is not None:
+                emit(app_name)
+            msg = wintypes.MSG()
+            while self.user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                self.user32.TranslateMessage(ctypes.byref(msg))
+                self.user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            self.user32.UnhookWinEvent(hook)
+    
+    def app_name(self, hwnd) -> Optional[str]:
+        if not hwnd:
+            return None
+        pid = wintypes.DWORD()
+        self.user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+        app_name = self._apps.get(pid.value)
+        if app_name is not None:
+            return app_name
+        handle = self.kernel32.OpenProcess(self.PROCESS_QUERY_LIMITED_INFORMATION, False, pid.value)
+        if not handle:
+            return None
+        try:
+            size = wintypes.DWORD(1024)
+            buffer = ctypes.create_unicode_buffer(size.value)
+            if not self.kernel32.QueryFullProcessImageNameW(handle, 0, buffer, ctypes.byref(size)):
+                return None
+        finally:
+            self.kernel32.CloseHandle(handle)
+        app_name = os.path.basename(buffer.value).lower()
+        if len(self._apps) >= self.APP_CACHE_SIZE:
+            self._apps.clear()
+        self._apps[pid.value] = app_name
+        return app_name
+    
+    def stop(self):
+        if self._thread is None:
+            return
+        if self._thread_id is not None:
+            self.user32.PostThreadMessageW(self._thread_id, self.WM_QUIT, 0, 0)
+        self._thread.join(1.0)
+        self._thread = None
+        self._thread_id = None
+
+class ForegroundWatcher:
+    
+    def __init__(self, resolve, switch):
+        self.resolve = resolve
+        self.switch = switch
+        self.sources: list[ForegroundSource] = []
+        self.current_app: Optional[str] = None
+        self.target: Optional[str] = None
+        self.switches = 0
+    
+    def add_source(self, source: ForegroundSource) -> ForegroundSource:
+        source.start(self.on_foreground)
+        self.sources.append(source)
+        return source
+    
+    def on_foreground(self, app_name: str) -> bool:
+        if app_name == self.current_app:
+            return False
+        self.current_app = app_name
+        profile = self.resolve(app_name)
+        if profile is None or profile.profile_id == self.target:
+            return False
+        self.target = profile.profile_id
+        self.switches += 1
+        self.switch(profile)
+        return True
+    
+    def stop(self):
+        for source in self.sources:
+            source.stop()
+        self.sources.clear()
+
+class ControlCommands:
+    
+    def __init__(self, dispatcher: InjectionDispatcher, repeat_jobs: RepeatJobManager, resolve_slot,
+                 switch_profile=None, show_page=None, call_in_gui=None):
+        self.dispatcher = dispatcher
+        self.repeat_jobs = repeat_jobs
+        self.resolve_slot = resolve_slot
+        self.switch_profile = switch_profile
+        self.show_page = show_page
+        self.call_in_gui = call_in_gui
+        self.handlers = {
+            "ping": self.ping,
+            "press": self.press,
+            "repeat": self.repeat,
+            "stop": self.stop,
+            "jobs": self.jobs,
+            "profile": self.profile,
+            "page": self.page,
+            "metrics": self.metrics,
+        }
+    
+    MAX_PRESS_COUNT = 10000
+    
+    @staticmethod
+    def number(command: dict, name: str, cast, default=None, minimum: float = 0, maximum: float = math.inf):
+        value = command.get(name, default)
+        if value is None:
+            return None
+        try:
+            if isinstance(value, bool):
+                raise TypeError
+            value = cast(value)
+            if not minimum <= value <= maximum or not math.isfinite(value):
+                raise ValueError
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError(f"{name} must be a number in [{minimum}, {maximum}], got {command.get(name)!r}") from None
+        return value
+    
+    def execute(self, command: dict):
+        if not isinstance(command, dict):
+            raise ValueError("command must be a JSON object")
+        handler = self.handlers.get(command.get("op"))
+        if handler is None:
+            raise ValueError(f"unknown op: {command.get('op')!r}")
+        return handler(command)
+    
+    def ping(self, command: dict) -> dict:
+        return {"ok": True}
+    
+    def press(self, command: dict):
+        count = self.number(command, "count", int, 1, 1, self.MAX_PRESS_COUNT)
+        delay_ms = self.number(command, "delay_ms", int, 25, 0, 60000)
+        if "slot" in command:
+            binding = self.resolve_slot(str(command["slot"]).upper().strip())
+            if binding is None:
+                raise ValueError(f"unknown slot: {command['slot']!r}")
+            if binding.plan is not None:
+                futures = [self.dispatcher.submit_plan(binding.plan) for _ in range(count)]
+            else:
+                futures = [self.dispatcher.submit(binding.output_key, delay_ms) for _ in range(count)]
+        else:
+            key_name = CHORD_LOOKUP.get(str(command.get("key", "")).upper().strip())
+            if key_name is None:
+                raise ValueError(f"unknown key: {command.get('key')!r}")
+            futures = [self.dispatcher.submit(key_name, delay_ms) for _ in range(count)]
+        
+        if not command.get("wait") or not futures:
+            return {"ok": True, "queued": len(futures)}
+        
+        done: Future = Future()
+        futures[-1].add_done_callback(lambda _future: done.set_result({
+            "ok": all(future.exception() is None and future.result() for future in futures),
+            "queued": len(futures),
+        }))
+        return done
+    
+    def repeat(self, command: dict) -> dict:
+        key_name = CHORD_LOOKUP.get(str(command.get("key", "")).upper().strip())
+        if key_name is None:
+            raise ValueError(f"unknown key: {command.get('key')!r}")
+        overrun_policy = command.get("overrun", "skip")
+        if overrun_policy not in OVERRUN_POLICIES:
+            raise ValueError(f"unknown overrun policy: {overrun_policy!r}")
+        job = self.repeat_jobs.add_job(
+            key_name,
+            self.number(command, "interval_ms", int, 1000, 1),
+            self.number(command, "max_count", int, None, 1),
+            self.number(command, "max_duration_s", float, None, 1e-3),
+            overrun_policy,
+            self.number(command, "burst_cap", int, RepeatJob.DEFAULT_BURST_CAP, 1),
+        )
+        return {"ok": True, "job_id": job.job_id}
+    
+    def stop(self, command: dict) -> dict:
+        if command.get("all"):
+            self.repeat_jobs.stop_all()
+            return {"ok": True}
+        job_id = self.number(command, "job_id", int, None, 1)
+        if job_id is None:
+            raise ValueError("stop needs a job_id or \"all\": true")
+        return {"ok": self.repeat_jobs.stop(job_id)}
+    
+    def jobs(self, command: dict) -> dict:
+        return {"ok": True, "jobs": [
+            {
+                "job_id": job.job_id,
+                "key": job.key_name,
+                "interval_ms": job.interval_ms,
+                "state": job.state,
+                "count": job.count,
+            }
+            for job in self.repeat_jobs.jobs()
+        ]}
+    
+    def metrics(self, command: dict) -> dict:
+        return {"ok": True, "metrics": self.dispatcher.metrics.to_dict()}
+    
+    def profile(self, command: dict):
+        return self._gui(self.switch_profile, str(command.get("profile", "")))
+    
+    def page(self, command: dict):
+        return self._gui(self.show_page, int(command.get("page", 0)))
+    
+    def _gui(self, action, *args):
+        if action is None:
+            raise ValueError("not supported by this pad")
+        if self.call_in_gui is None:
+            return {"ok": action(*args) is not False}
+        done: Future = Future()
+        result = self.call_in_gui(action, *args)
+        result.add_done_callback(lambda future: done.set_result({"ok": future.result() is not False}))
+        return done
+
+class ControlServer:
+    
+    FRAME_LIMIT = 1 << 20
+    
+    def __init__(self, execute, address: str):
+        self.execute = execute
+        self.address = address
+        self.bound_address: Optional[str] = None
+        self._loop = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._clients: set = set()
+        self._unix_path: Optional[str] = None
+    
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._run, name="stackpad-control", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+        return self.bound_address
+    
+    def stop(self, timeout: Optional[float] = 1.0):
+        if self._loop is not None and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self._unix_path is not None:
+            with contextlib.suppress(OSError):
+                os.unlink(self._unix_path)
+            self._unix_path = None
+    
+    @staticmethod
+    def loopback_host(host: str) -> str:
+        host = host.strip("[]") or "127.0.0.1"
+        if host.lower() == "localhost":
+            return "127.0.0.1"
+        try:
+            is_loopback = ipaddress.ip_address(host).is_loopback
+        except ValueError:
+            is_loopback = False
+        if not is_loopback:
+            raise ValueError(f"control server only listens on loopback addresses, not '{host}'")
+        return host
+    
+    @staticmethod
+    def remove_stale_socket(path: str):
+        try:
+            if not stat.S_ISSOCK(os.stat(path).st_mode):
+                return
+        except OSError:
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)
+        else:
+            raise OSError(f"control socket {path} is already in use")
+        finally:
+            probe.close()
+    
+    def _run(self):
+        import asyncio
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            servers = loop.run_until_complete(self._serve())
+        except Exception as exc:
+            self._error = exc
+            self._ready.set()
+            loop.close()
+            return
+        self._loop = loop
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            for server in servers:
+                server.close()
+            for writer in list(self._clients):
+                writer.close()
+            loop.run_until_complete(asyncio.gather(*asyncio.all_tasks(loop), return_exceptions=True))
+            loop.close()
+    
+    async def _serve(self) -> list:
+        import asyncio
+        kind, _, target = self.address.partition(":")
+        if kind == "tcp":
+            host, _, port = target.rpartition(":")
+            server = await asyncio.start_server(
+                self._handle, self.loopback_host(host), int(port), limit=self.FRAME_LIMIT
+            )
+            host, port = server.sockets[0].getsockname()[:2]
+            self.bound_address = f"tcp:[{host}]:{port}" if ":" in host else f"tcp:{host}:{port}"
+            return [server]
+        if kind == "unix":
+            self.remove_stale_socket(target)
+            server = await asyncio.start_unix_server(self._handle, target, limit=self.FRAME_LIMIT)
+            self._unix_path = target
+            self.bound_address = f"unix:{target}"
+            return [server]
+        if kind == "pipe":
+            if sys.platform != "win32":
+                raise ValueError("pipe: control addresses are only available on Windows, use unix:PATH or tcp:HOST:PORT")
+            loop = asyncio.get_running_loop()
+            servers = await loop.start_serving_pipe(
+                lambda: asyncio.StreamReaderProtocol(
+                    asyncio.StreamReader(limit=self.FRAME_LIMIT), self._handle
+                ),
+                target,
+            )
+            self.bound_address = f"pipe:{target}"
+            return servers
+        raise ValueError(f"unknown control address '{self.address}' (use tcp:HOST:PORT, unix:PATH or pipe:NAME)")
+    
+    async def _handle(self, reader, writer):
+        self._clients.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write(await self._respond(line))
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+    
+    async def _respond(self, line: bytes) -> bytes:
+        try:
+            frame = json.loads(line)
+        except ValueError as exc:
+            reply = {"ok": False, "error": f"invalid JSON: {exc}"}
+        else:
+            if isinstance(frame, list):
+                reply = [await self._run_command(command) for command in frame]
+            else:
+                reply = await self._run_command(frame)
+        return (json.dumps(reply) + "\n").encode()
+    
+    async def _run_command(self, command) -> dict:
+        import asyncio
+        try:
+            result = self.execute(command)
+            if isinstance(result, Future):
+                result = await asyncio.wrap_future(result)
+            return result
+        except Exception as exc:
+            return {"ok": False, "error": str(exc)}
+
+def get_f_key_list() -> list[str]:
+    return list(VK.keys())
+
+MACRO_ACTIONS = ("tap", "down", "up")
+
+class MacroStep(BaseModel):
+    model_config = ConfigDict(defer_build=True, frozen=True)
+    
+    key: str = Field(default="F13")
+    action: str = Field(default="tap")
+    hold_ms: int = Field(default=25, ge=0, le=60000)
+    delay_ms: int = Field(default=0, ge=0, le=600000)
+    repeat: int = Field(default=1, ge=1, le=1000)
+    
+    @field_validator("key")
+    @classmethod
+    def validate_key(cls, v: str) -> str:
+        return canonical_chord(v) or "F13"
+    
+    @field_validator("action")
+    @classmethod
+    def validate_action(cls, v: str) -> str:
+        v = v.lower().strip()
+        if v not in MACRO_ACTIONS:
+            return "tap"
+        return v
+
+class MacroPlan:
+    
+    __slots__ = ("events", "duration_s", "presses")
+    
+    def __init__(self, events: tuple[tuple[float, bool, str], ...]):
+        self.events = events
+        self.duration_s = events[-1][0] if events else 0.0
+        counts: dict[str, int] = {}
+        for _, down, key_name in events:
+            if down:
+                counts[key_name] = counts.get(key_name, 0) + 1
+        self.presses = tuple(counts.items())
+    
+    def execute(self, backend: Optional[InjectionBackend] = None, clock=time.perf_counter) -> bool:
+        backend = backend or get_backend()
+        press = backend.press
+        release = backend.release
+        held: set[str] = set()
+        ok = True
+        with _HighResolutionTimer():
+            started = clock()
+            try:
+                for offset, down, key_name in self.events:
+                    sleep_until(started + offset, clock)
+                    if down:
+                        ok = press(key_name) and ok
+                        held.add(key_name)
+                    else:
+                        ok = release(key_name) and ok
+                        held.discard(key_name)
+            finally:
+                for key_name in held:
+                    release(key_name)
+        return ok
+
+def compile_macro(steps: tuple[MacroStep, ...]) -> MacroPlan:
+    events: list[tuple[float, bool, str]] = []
+    held: list[str] = []
+    offset_ms = 0
+    for step in steps:
+        for _ in range(step.repeat):
+            if step.action != "up":
+                events.append((offset_ms / 1000.0, True, step.key))
+                if step.key not in held:
+                    held.append(step.key)
+            if step.action == "tap":
+                offset_ms += step.hold_ms
+            if step.action != "down":
+                events.append((offset_ms / 1000.0, False, step.key))
+                if step.key in held:
+                    held.remove(step.key)
+            offset_ms += step.delay_ms
+    for key_name in held:
+        events.append((offset_ms / 1000.0, False, key_name))
+    return MacroPlan(tuple(events))
+
+COLOR_TAGS = ("purple", "cyan", "green", "orange", "red", "blue", "yellow", "gray")
+
+class KeyBinding(BaseModel):
+    model_config = ConfigDict(defer_build=True, frozen=True)
+    
+    label: str = Field(default="", max_length=18)
+    color_tag: str = Field(default="gray")
+    output_key: str = Field(default="F13")
+    macro: tuple[MacroStep, ...] = ()
+    
+    @cached_property
+    def plan(self) -> Optional[MacroPlan]:
+        return compile_macro(self.macro) if self.macro else None
+    
+    @field_validator("color_tag")
+    @classmethod
+    def validate_color_tag(cls, v: str) -> str:
+        if v not in COLOR_TAGS:
+            return "gray"
+        return v
+    
+    @field_validator("output_key")
+    @classmethod
+    def validate_output_key(cls, v: str) -> str:
+        return canonical_chord(v) or "F13"
+
+class Profile(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
+    profile_id: str
+    profile_name: str
+    description: str = ""
+    icon: str = "default"
+    bindings: dict[str, KeyBinding] = Field(default_factory=dict)
+    pages: list[dict[str, KeyBinding]] = Field(default_factory=list)
+    match_apps: list[str] = Field(default_factory=list)
+    
+    @field_validator("match_apps")
+    @classmethod
+    def validate_match_apps(cls, v: list[str]) -> list[str]:
+        return [pattern.strip().lower() for pattern in v if pattern.strip()]
+
+def _name_key(name: str) -> str:
+    return name.strip().casefold()
+
+class ProfileLibrary:
+    
+    MAGIC = b"SPADLIB\x00"
+    VERSION = 1
+    HEADER = struct.Struct("<8sIIQ")
+    ENTRY = struct.Struct("<QIQI")
+    DEFAULT_CACHE_SIZE = 32
+    
+    def __init__(self, path: Path, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.path = Path(path)
+        self.cache_size = max(1, cache_size)
+        self.cache: OrderedDict[str, Profile] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._names: Optional[dict[str, str]] = None
+        self._ids: Optional[list[str]] = None
+        self._corrupt: set[int] = set()
+        self._fallback: Optional[dict[bytes, int]] = None
+        self._has_apps: Optional[bool] = None
+        with open(self.path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._map) < self.HEADER.size:
+                raise ValueError(f"{self.path} is not a STACK-PAD profile library")
+            magic, version, self.count, self.index_offset = self.HEADER.unpack_from(self._map, 0)
+            if magic != self.MAGIC or version != self.VERSION:
+                raise ValueError(f"{self.path} is not a STACK-PAD profile library")
+            if not self.HEADER.size <= self.index_offset <= len(self._map) - self.count * self.ENTRY.size:
+                raise ValueError(f"{self.path} is truncated or corrupt")
+        except (struct.error, ValueError):
+            self._map.close()
+            raise
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def __contains__(self, profile_id: str) -> bool:
+        return self.find(profile_id) is not None
+    
+    def _entry(self, index: int) -> tuple[int, int, int, int]:
+        entry = self.ENTRY.unpack_from(self._map, self.index_offset + index * self.ENTRY.size)
+        record_offset, record_length, meta_offset, meta_length = entry
+        if record_offset + record_length > self.index_offset or meta_offset + meta_length > self.index_offset:
+            raise ValueError(f"{self.path} entry {index} points outside the library")
+        return entry
+    
+    def _meta(self, index: int) -> list[str]:
+        _, _, meta_offset, meta_length = self._entry(index)
+        meta = self._map[meta_offset:meta_offset + meta_length].decode("utf-8").split("\x00")
+        if len(meta) != 3:
+            raise ValueError(f"{self.path} entry {index} has malformed metadata")
+        return meta
+    
+    def _id_bytes(self, index: int) -> bytes:
+        _, _, meta_offset, meta_length = self._entry(index)
+        end = self._map.find(b"\x00", meta_offset, meta_offset + meta_length)
+        if end < 0:
+            raise ValueError(f"{self.path} entry {index} has malformed metadata")
+        return self._map[meta_offset:end]
+    
+    def _skip(self, index: int, error: Exception):
+        if index not in self._corrupt:
+            self._corrupt.add(index)
+            log.warning("Skipping corrupt profile library entry: %s", error)
+    
+    def _scan_meta(self):
+        for index in range(self.count):
+            try:
+                yield self._meta(index)
+            except ValueError as exc:
+                self._skip(index, exc)
+    
+    def find(self, profile_id: str) -> Optional[int]:
+        key = profile_id.encode("utf-8")
+        if self._fallback is not None:
+            return self._fallback.get(key)
+        try:
+            low, high = 0, self.count
+            while low < high:
+                middle = (low + high) // 2
+                if self._id_bytes(middle) < key:
+                    low = middle + 1
+                else:
+                    high = middle
+            if low < self.count and self._id_bytes(low) == key:
+                return low
+            return None
+        except ValueError:
+            self._fallback = {}
+            for index in range(self.count):
+                try:
+                    self._fallback.setdefault(self._id_bytes(index), index)
+                except ValueError as exc:
+                    self._skip(index, exc)
+            return self._fallback.get(key)
+    
+    def get(self, profile_id: str) -> Optional[Profile]:
+        profile = self.cache.get(profile_id)
+        if profile is not None:
+            self.cache.move_to_end(profile_id)
+            self.hits += 1
+            return profile
+        try:
+            index = self.find(profile_id)
+            if index is None:
+                return None
+            record_offset, record_length, _, _ = self._entry(index)
+            profile = Profile.model_validate_json(self._map[record_offset:record_offset + record_length])
+        except ValueError as exc:
+            log.warning("Could not load profile %r from %s: %s", profile_id, self.path, exc)
+            return None
+        self.misses += 1
+        self.cache[profile_id] = profile
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+            self.evictions += 1
+        return profile
+    
+    def ids(self) -> list[str]:
+        if self._ids is None:
+            self._ids = [meta[0] for meta in self._scan_meta()]
+        return self._ids
+    
+    def find_by_name(self, name: str) -> Optional[str]:
+        if self._names is None:
+            names = {}
+            for profile_id, profile_name, _ in self._scan_meta():
+                names.setdefault(_name_key(profile_name), profile_id)
+            self._names = names
+        return self._names.get(_name_key(name))
+    
+    def has_app_rules(self) -> bool:
+        if self._has_apps is None:
+            self._has_apps = any(apps for _, _, apps in self._scan_meta())
+        return self._has_apps
+    
+    def for_app(self, app_name: str) -> Optional[str]:
+        for profile_id, _, apps in self._scan_meta():
+            if apps and any(fnmatch.fnmatchcase(app_name, pattern) for pattern in apps.split("\x1f")):
+                return profile_id
+        return None
+    
+    def cache_summary(self) -> str:
+        return (
+            f"{len(self.cache)}/{self.cache_size} cached, "
+            f"{self.hits} hits, {self.misses} misses, {self.evictions} evictions"
+        )
+    
+    def close(self):
+        self.cache.clear()
+        self._map.close()
+    
+    @classmethod
+    def write(cls, path: Path, profiles: list[dict]):
+        records = []
+        metas = []
+        for data in sorted(profiles, key=lambda data: data["profile_id"].encode("utf-8")):
+            profile = Profile(**data)
+            records.append(profile.model_dump_json().encode("utf-8"))
+            metas.append("\x00".join((
+                profile.profile_id, profile.profile_name, "\x1f".join(profile.match_apps),
+            )).encode("utf-8"))
+        
+        offset = cls.HEADER.size
+        entries = []
+        for record in records:
+            entries.append([offset, len(record)])
+            offset += len(record)
+        for entry, meta in zip(entries, metas):
+            entry.extend((offset, len(meta)))
+            offset += len(meta)
+        
+        chunks = [cls.HEADER.pack(cls.MAGIC, cls.VERSION, len(records), offset)]
+        chunks.extend(records)
+        chunks.extend(metas)
+        chunks.extend(cls.ENTRY.pack(*entry) for entry in entries)
+        _atomic_write(Path(path), b"".join(chunks))
+
+class ProfileRegistry:
+    
+    def __init__(self, profiles: list[Profile], library: Optional[ProfileLibrary] = None):
+        self.profiles = profiles
+        self.library = library
+        self._by_id: dict[str, Profile] = {}
+        self._by_name: dict[str, list[str]] = {}
+        self._order: list[str] = []
+        self._positions: Optional[dict[str, int]] = None
+        self._app_cache: dict[str, Optional[str]] = {}
+        self.rebuild()
+    
+    def attach_library(self, library: Optional[ProfileLibrary]):
+        self.library = library
+        self._positions = None
+        self._app_cache = {}
+    
+    def rebuild(self):
+        self._by_id = {}
+        self._by_name = {}
+        self._positions = None
+        self._app_cache = {}
+        for profile in self.profiles:
+            self._by_id.setdefault(profile.profile_id, profile)
+            self._by_name.setdefault(_name_key(profile.profile_name), []).append(profile.profile_id)
+    
+    def __len__(self) -> int:
+        if self.library is None:
+            return len(self._by_id)
+        shadowed = sum(1 for profile_id in self._by_id if profile_id in self.library)
+        return len(self._by_id) + len(self.library) - shadowed
+    
+    def __contains__(self, profile_id: str) -> bool:
+        return profile_id in self._by_id or (self.library is not None and profile_id in self.library)
+    
+    def owns(self, profile_id: str) -> bool:
+        return profile_id in self._by_id
+    
+    def get(self, profile_id: str) -> Optional[Profile]:
+        profile = self._by_id.get(profile_id)
+        if profile is None and self.library is not None:
+            profile = self.library.get(profile_id)
+        return profile
+    
+    def find_by_name(self, name: str) -> Optional[Profile]:
+        ids = self._by_name.get(_name_key(name))
+        if ids:
+            return self._by_id[ids[0]]
+        if self.library is not None:
+            profile_id = self.library.find_by_name(name)
+            if profile_id is not None and profile_id not in self._by_id:
+                return self.get(profile_id)
+        return None
+    
+    def resolve(self, id_or_name: str) -> Optional[Profile]:
+        return self.get(id_or_name) or self.find_by_name(id_or_name)
+    
+    def for_app(self, app_name: str) -> Optional[Profile]:
+        app_name = app_name.lower()
+        try:
+            profile_id = self._app_cache[app_name]
+        except KeyError:
+            profile_id = None
+            for profile in self.profiles:
+                if any(fnmatch.fnmatchcase(app_name, pattern) for pattern in profile.match_apps):
+                    profile_id = profile.profile_id
+                    break
+            if profile_id is None and self.library is not None:
+                profile_id = self.library.for_app(app_name)
+            self._app_cache[app_name] = profile_id
+        return self.get(profile_id) if profile_id is not None else None
+    
+    def has_app_rules(self) -> bool:
+        if any(profile.match_apps for profile in self.profiles):
+            return True
+        return self.library is not None and self.library.has_app_rules()
+    
+    def neighbor(self, profile_id: str, step: int = 1) -> Optional[Profile]:
+        if self._positions is None:
+            order = [profile.profile_id for profile in self.profiles]
+            if self.library is not None:
+                order.extend(library_id for library_id in self.library.ids() if library_id not in self._by_id)
+            self._order = order
+            self._positions = {order_id: index for index, order_id in enumerate(order)}
+        if not self._order:
+            return None
+        index = self._positions.get(profile_id, -step)
+        return self.get(self._order[(index + step) % len(self._order)])
+    
+    def add(self, profile: Profile) -> Profile:
+        if profile.profile_id in self._by_id:
+            raise ValueError(f"Profile id already exists: {profile.profile_id}")
+        self.profiles.append(profile)
+        self._by_id[profile.profile_id] = profile
+        self._app_cache = {}
+        self._by_name.setdefault(_name_key(profile.profile_name), []).append(profile.profile_id)
+        if self._positions is not None and self.library is None:
+            self._positions[profile.profile_id] = len(self._order)
+            self._order.append(profile.profile_id)
+        else:
+            self._positions = None
+        return profile
+    
+    def remove(self, profile_id: str) -> Optional[Profile]:
+        if self.library is not None and profile_id in self.library:
+            raise ValueError(f"Profile {profile_id} comes from the read-only profile library and cannot be removed")
+        profile = self._by_id.pop(profile_id, None)
+        if profile is None:
+            return None
+        self.profiles.remove(profile)
+        self._unindex_name(profile)
+        self._positions = None
+        self._app_cache = {}
+        return profile
+    
+    def rename(self, profile_id: str, profile_name: str) -> Optional[Profile]:
+        profile = self._by_id.get(profile_id)
+        if profile is None:
+            if self.library is not None and profile_id in self.library:
+                raise ValueError(f"Profile {profile_id} must be adopted from the profile library before it can be renamed")
+            return None
+        self._unindex_name(profile)
+        profile.profile_name = profile_name
+        self._by_name.setdefault(_name_key(profile_name), []).append(profile_id)
+        return profile
+    
+    def _unindex_name(self, profile: Profile):
+        key = _name_key(profile.profile_name)
+        ids = self._by_name.get(key, [])
+        if profile.profile_id in ids:
+            ids.remove(profile.profile_id)
+        if not ids:
+            self._by_name.pop(key, None)
+
+_default_bindings: dict[str, KeyBinding] = {}
+
+def default_binding(key_name: str) -> KeyBinding:
+    binding = _default_bindings.get(key_name)
+    if binding is None:
+        binding = KeyBinding.model_construct(label=key_name, output_key=key_name)
+        _default_bindings[key_name] = binding
+    return binding
+
+class KeypadModel:
+    
+    def __init__(self, profile: Profile, slots: Optional[list[str]] = None):
+        self.profile = profile
+        self.slots = slots if slots is not None else get_f_key_list()
+        for bindings in (profile.bindings, *profile.pages):
+            for binding in bindings.values():
+                binding.plan
+    
+    @property
+    def page_count(self) -> int:
+        return 1 + len(self.profile.pages)
+    
+    def page(self, index: int) -> dict[str, KeyBinding]:
+        return self.profile.bindings if index == 0 else self.profile.pages[index - 1]
+    
+    def binding(self, page: int, slot: str) -> KeyBinding:
+        return self.page(page).get(slot) or default_binding(slot)
+    
+    def page_bindings(self, index: int) -> dict[str, KeyBinding]:
+        bindings = self.page(index)
+        return {slot: bindings.get(slot) or default_binding(slot) for slot in self.slots}
+
+class RateLimit(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
+    rate_per_s: float = Field(gt=0, le=10000)
+    burst: int = Field(default=1, ge=1, le=10000)
+
+class AppConfig(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
+    default_profile_id: str = "default"
+    profiles: list[Profile] = Field(default_factory=list)
+    hotkeys: dict[str, str] = Field(default_factory=dict)
+    rate_limits: dict[str, RateLimit] = Field(default_factory=dict)
+    profile_library: str = ""
+    
+    @field_validator("hotkeys")
+    @classmethod
+    def validate_hotkeys(cls, v: dict[str, str]) -> dict[str, str]:
+        hotkeys = {}
+        for hotkey, slot in v.items():
+            slot = slot.upper().strip()
+            if slot not in VK:
+                log.warning("Ignoring hotkey %r: %r is not a keypad slot", hotkey, slot)
+            elif not valid_hotkey(hotkey):
+                log.warning("Ignoring malformed hotkey %r", hotkey)
+            else:
+                hotkeys[hotkey] = slot
+        return hotkeys
+    
+    @field_validator("rate_limits")
+    @classmethod
+    def validate_rate_limits(cls, v: dict[str, RateLimit]) -> dict[str, RateLimit]:
+        limits = {}
+        for key_name, limit in v.items():
+            key_name = RateLimiter.GLOBAL if key_name.strip() == RateLimiter.GLOBAL else canonical_chord(key_name)
+            if key_name is not None:
+                limits[key_name] = limit
+        return limits
+    
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        return RateLimiter(self.rate_limits) if self.rate_limits else None
+    
+    @cached_property
+    def registry(self) -> ProfileRegistry:
+        return ProfileRegistry(self.profiles)
+    
+    def get_profile(self, profile_id: str) -> Optional[Profile]:
+        return self.registry.get(profile_id)
+    
+    def get_default_profile(self) -> Optional[Profile]:
+        return self.get_profile(self.default_profile_id)
+
+EMBEDDED_CONFIG = {
+    "default_profile_id": "default",
+    "profiles": [
+        {
+            "profile_id": "default",
+            "profile_name": "Default",
+            "description": "General shortcuts for Discord + media controls.",
+            "icon": "default",
+            "bindings": {
+                "F13": {
+                    "label": " Mute",
+                    "color_tag": "red",
+                    "output_key": "F13"
+                },
+                "F14": {
+                    "label": "Discord Deafen",
+                    "color_tag": "purple",
+                    "output_key": "F14"
+                },
+                "F15": {
+                    "label": "Media Mute",
+                    "color_tag": "cyan",
+                    "output_key": "F15"
+                },
+                "F16": {
+                    "label": "Vol +",
+                    "color_tag": "cyan",
+                    "output_key": "F16"
+                },
+                "F17": {
+                    "label": "Vol -",
+                    "color_tag": "cyan",
+                    "output_key": "F17"
+                },
+                "F18": {
+                    "label": "Push-To-Talk",
+                    "color_tag": "green",
+                    "output_key": "F18"
+                },
+                "F19": {
+                    "label": "Screenshot",
+                    "color_tag": "orange",
+                    "output_key": "F19"
+                },
+                "F20": {
+                    "label": "OBS Start/Stop",
+                    "color_tag": "red",
+                    "output_key": "F20"
+                },
+                "F21": {
+                    "label": "Scene Next",
+                    "color_tag": "red",
+                    "output_key": "F21"
+                },
+                "F22": {
+                    "label": "Scene Prev",
+                    "color_tag": "red",
+                    "output_key": "F22"
+                },
+                "F23": {
+                    "label": "Browser Focus",
+                    "color_tag": "blue",
+                    "output_key": "F23"
+                },
+                "F24": {
+                    "label": "Gaming Mode",
+                    "color_tag": "yellow",
+                    "output_key": "F24"
+                }
+            }
+        }
+    ]
+}
+
+def get_config_dir() -> Path:
+    override = os.environ.get("STACK_PAD_CONFIG_DIR")
+    if override:
+        return Path(override)
+    base = os.environ.get("APPDATA")
+    return Path(base) / "STACK-PAD" if base else Path.home() / ".config" / "STACK-PAD"
+
+CONFIG_CACHE_VERSION = b"stack-pad-config-cache-4"
+
+@contextlib.contextmanager
+def _gc_paused():
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+class BindingPool:
     
-    def create_key_grid(self) -> QWidget:
-        grid_widget = QWidget()
-        main_layout = QVBoxLayout(grid_widget)
-        main_layout.setContentsMargins(0, 0, 0, 0)
-        main_layout.setSpacing(5)
-        
-        key_grid = QGridLayout()
-        key_grid.setSpacing(10)
-        
-        self.key_buttons = {}
-        f_keys = get_f_key_list()
+    def __init__(self):
+        self.bindings: list[KeyBinding] = []
+        self._ids: dict[tuple, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self.bindings)
+    
+    @staticmethod
+    def key(values: dict) -> tuple:
+        macro = values.get("macro")
+        return (
+            values.get("label"),
+            values.get("color_tag"),
+            values.get("output_key"),
+            tuple(tuple(step.get(name) for name in MacroStep.model_fields) for step in macro) if macro else (),
+        )
+    
+    def intern(self, values: dict) -> int:
+        key = self.key(values)
+        index = self._ids.get(key)
+        if index is None:
+            values = dict(values)
+            if "macro" in values:
+                values["macro"] = tuple(MacroStep.model_construct(**step) for step in values["macro"])
+            index = len(self.bindings)
+            self.bindings.append(KeyBinding.model_construct(**values))
+            self._ids[key] = index
+        return index
+    
+    def binding(self, values: dict) -> KeyBinding:
+        return self.bindings[self.intern(values)]
+
+def construct_config(data: dict, pool: Optional[BindingPool] = None) -> "AppConfig":
+    pool = pool if pool is not None else BindingPool()
+    
+    def construct_bindings(bindings: dict) -> dict:
+        return {key_name: pool.binding(binding) for key_name, binding in bindings.items()}
+    
+    profiles = []
+    for profile in data.get("profiles", []):
+        profiles.append(Profile.model_construct(**{
+            **profile,
+            "bindings": construct_bindings(profile.get("bindings", {})),
+            "pages": [construct_bindings(page) for page in profile.get("pages", [])],
+        }))
+    return AppConfig.model_construct(
+        default_profile_id=data.get("default_profile_id", "default"),
+        profiles=profiles,
+        hotkeys=dict(data.get("hotkeys", {})),
+        profile_library=data.get("profile_library", ""),
+        rate_limits={
+            key_name: RateLimit.model_construct(**limit)
+            for key_name, limit in data.get("rate_limits", {}).items()
+        },
+    )
+
+def _atomic_write(path: Path, content: str | bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    try:
+        with (os.fdopen(fd, "wb") if isinstance(content, bytes) else os.fdopen(fd, "w", encoding="utf-8")) as tmp:
+            tmp.write(content)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+def apply_config_op(data: dict, op: dict) -> dict:
+    kind = op.get("op")
+    if kind == "replace":
+        return op["config"]
+    if data is None:
+        return data
+    profiles = data.setdefault("profiles", [])
+    if kind == "binding":
+        for profile in profiles:
+            if profile.get("profile_id") == op["profile_id"]:
+                page = op.get("page", 0)
+                if page == 0:
+                    profile.setdefault("bindings", {})[op["key"]] = op["binding"]
+                else:
+                    pages = profile.setdefault("pages", [])
+                    while len(pages) < page:
+                        pages.append({})
+                    pages[page - 1][op["key"]] = op["binding"]
+                break
+    elif kind == "add_page":
+        for profile in profiles:
+            if profile.get("profile_id") == op["profile_id"]:
+                pages = profile.setdefault("pages", [])
+                while len(pages) < op["page"]:
+                    pages.append({})
+                break
+    elif kind == "add_profile":
+        new_profile = op["profile"]
+        profiles[:] = [p for p in profiles if p.get("profile_id") != new_profile["profile_id"]]
+        profiles.append(new_profile)
+    elif kind == "remove_profile":
+        profiles[:] = [p for p in profiles if p.get("profile_id") != op["profile_id"]]
+    elif kind == "rename_profile":
+        for profile in profiles:
+            if profile.get("profile_id") == op["profile_id"]:
+                profile["profile_name"] = op["profile_name"]
+                break
+    return data
+
+class ConfigStore:
+    
+    DEBOUNCE_S = 0.1
+    MAX_DELAY_S = 0.3
+    COMPACT_IDLE_S = 2.0
+    COMPACT_EVERY = 256
+    RETRY_S = 1.0
+    
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.config_path = self.directory / "config.json"
+        self.journal_path = self.directory / "config.journal"
+        self.cache_path = self.directory / "config.cache.json"
+        self._state: Optional[dict] = None
+        self._pending: list[dict] = []
+        self._first_op_at = 0.0
+        self._last_op_at = 0.0
+        self._journal_entries = 0
+        self._retry_at = 0.0
+        self.error: Optional[BaseException] = None
+        self._flush_requested = 0
+        self._flushed = 0
+        self._written = threading.Condition()
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+    
+    def read_sources(self) -> tuple[Optional[bytes], bytes]:
+        config_bytes = self.config_path.read_bytes() if self.config_path.exists() else None
+        journal_bytes = self.journal_path.read_bytes() if self.journal_path.exists() else b""
+        return config_bytes, journal_bytes
+    
+    def source_digest(self, config_bytes: Optional[bytes], journal_bytes: bytes, default: dict) -> str:
+        digest = hashlib.sha256(CONFIG_CACHE_VERSION)
+        if config_bytes is None:
+            config_bytes = json.dumps(default, sort_keys=True).encode("utf-8")
+        digest.update(config_bytes)
+        digest.update(b"\0")
+        digest.update(journal_bytes)
+        return digest.hexdigest()
+    
+    def parse(self, config_bytes: Optional[bytes], journal_bytes: bytes, default: dict) -> dict:
+        if config_bytes is not None:
+            data = json.loads(config_bytes.decode("utf-8"))
+        else:
+            data = json.loads(json.dumps(default))
         
-        for idx, key_name in enumerate(f_keys):
-            row = idx // 3
-            col = idx % 3
-            
-            binding = None
-            if self.current_profile and key_name in self.current_profile.bindings:
-                binding = self.current_profile.bindings[key_name]
+        self._journal_entries = 0
+        for line in journal_bytes.decode("utf-8", errors="replace").splitlines():
+            try:
+                op = json.loads(line)
+            except ValueError:
+                break
+            data = apply_config_op(data, op)
+            self._journal_entries += 1
+        return data
+    
+    def read(self, default: dict) -> dict:
+        return self.parse(*self.read_sources(), default)
+    
+    def count_journal(self, journal_bytes: bytes):
+        self._journal_entries = journal_bytes.count(b"\n")
+    
+    def read_cache(self, digest: str) -> Optional[dict]:
+        try:
+            cached = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cached, dict) or cached.get("hash") != digest:
+            return None
+        return cached.get("config")
+    
+    def write_cache(self, digest: str, data: dict):
+        _atomic_write(self.cache_path, json.dumps({"hash": digest, "config": data}, separators=(",", ":")))
+    
+    def write_cache_async(self, digest: str, data: dict):
+        def write():
+            try:
+                self.write_cache(digest, data)
+            except OSError:
+                pass
+        threading.Thread(target=write, name="stackpad-config-cache").start()
+    
+    def attach(self, state: Optional[dict]):
+        with self._cond:
+            self._state = state
+    
+    def set_aside(self) -> list[Path]:
+        suffix = f".bad-{time.strftime('%Y%m%d-%H%M%S')}"
+        moved = []
+        for path in (self.config_path, self.journal_path):
+            if path.exists():
+                target = path.with_name(path.name + suffix)
+                os.replace(path, target)
+                moved.append(target)
+        self._journal_entries = 0
+        return moved
+    
+    def record(self, op: dict):
+        with self._cond:
+            now = time.monotonic()
+            if not self._pending:
+                self._first_op_at = now
+            self._last_op_at = now
+            self._pending.append(op)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="stackpad-config", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+    
+    def flush(self, timeout: Optional[float] = 2.0) -> bool:
+        with self._cond:
+            if self._thread is None or self._closed:
+                return not self._pending
+            self._flush_requested += 1
+            target = self._flush_requested
+            self._cond.notify()
+        with self._written:
+            done = self._written.wait_for(lambda: self._flushed >= target, timeout)
+        with self._cond:
+            unwritten = len(self._pending)
+            error = self.error
+        if error is not None and unwritten:
+            log.error("%d settings change(s) could not be saved to %s: %s", unwritten, self.journal_path, error)
+            return False
+        return done
+    
+    def close(self, timeout: Optional[float] = 2.0):
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+    
+    def _next_batch(self) -> Optional[tuple[list[dict], bool, int]]:
+        while True:
+            if self._flush_requested > self._flushed:
+                ops, self._pending = self._pending, []
+                return ops, True, self._flush_requested
+            if self._closed:
+                return None
+            now = time.monotonic()
+            if self._pending:
+                due = min(self._last_op_at + self.DEBOUNCE_S, self._first_op_at + self.MAX_DELAY_S)
+                due = max(due, self._retry_at)
+                if now >= due:
+                    ops, self._pending = self._pending, []
+                    return ops, self._journal_entries + len(ops) >= self.COMPACT_EVERY, 0
+                self._cond.wait(due - now)
+            elif self._journal_entries:
+                if now - self._last_op_at >= self.COMPACT_IDLE_S:
+                    return [], True, 0
+                self._cond.wait(self._last_op_at + self.COMPACT_IDLE_S - now)
             else:
-                binding = KeyBinding(label=key_name, output_key=key_name)
-            
-            btn = KeyButton(key_name, binding)
-            btn.clicked_signal.connect(self.on_key_clicked)
-            self.key_buttons[key_name] = btn
-            key_grid.addWidget(btn, row, col)
-        
-        main_layout.addLayout(key_grid)
-        
-        return grid_widget
+                self._cond.wait()
     
-    def create_bottom_bar(self) -> QWidget:
-        bar = QWidget()
-        layout = QHBoxLayout(bar)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(8)
-        
-        self.edit_btn = QPushButton("Edit Mode")
-        self.edit_btn.setCheckable(True)
-        self.edit_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {COLORS["bg_secondary"]};
-                border: 1px solid {COLORS["border"]};
-                border-radius: 4px;
-                padding: 4px 8px;
-            }}
-            QPushButton:checked {{
-                background-color: {COLORS["accent_cyan"]};
-                color: {COLORS["bg_primary"]};
-            }}
-            QPushButton:hover {{
-                background-color: {COLORS["hover"]};
-            }}
-        """)
-        self.edit_btn.clicked.connect(self.toggle_edit_mode)
-        layout.addWidget(self.edit_btn)
-        
-        self.auto_repeat_btn = QPushButton("Auto Repeat")
-        self.auto_repeat_btn.setCheckable(True)
-        self.auto_repeat_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {COLORS["bg_secondary"]};
-                border: 1px solid {COLORS["border"]};
-                border-radius: 4px;
-                padding: 4px 8px;
-            }}
-            QPushButton:checked {{
-                background-color: {COLORS["accent_red"]};
-                color: {COLORS["text_primary"]};
-            }}
-            QPushButton:hover {{
-                background-color: {COLORS["hover"]};
-            }}
-        """)
-        self.auto_repeat_btn.clicked.connect(self.on_auto_repeat_clicked)
-        layout.addWidget(self.auto_repeat_btn)
-        
-        self.repeat_control_btn = QPushButton("Off")
-        self.repeat_control_btn.setCheckable(True)
-        self.repeat_control_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {COLORS["bg_secondary"]};
-                border: 1px solid {COLORS["border"]};
-                border-radius: 4px;
-                padding: 4px 8px;
-            }}
-            QPushButton:checked {{
-                background-color: {COLORS["accent_green"]};
-                color: {COLORS["text_primary"]};
-            }}
-            QPushButton:hover {{
-                background-color: {COLORS["hover"]};
-            }}
-        """)
-        self.repeat_control_btn.clicked.connect(self.toggle_repeat_control)
-        layout.addWidget(self.repeat_control_btn)
-        
-        layout.addStretch()
-        
-        return bar
+    def _run(self):
+        while True:
+            with self._cond:
+                batch = self._next_batch()
+            if batch is None:
+                return
+            ops, compact, flush_target = batch
+            written = self._write_ops(ops) if ops else True
+            if written and compact and self._state is not None and (ops or self._journal_entries):
+                try:
+                    self._write_snapshot()
+                except Exception as exc:
+                    log.warning("Could not compact %s, keeping the journal: %s", self.config_path, exc)
+                    with self._cond:
+                        self._last_op_at = time.monotonic()
+            if flush_target:
+                with self._written:
+                    self._flushed = max(self._flushed, flush_target)
+                    self._written.notify_all()
     
-    def init_tray(self):
-        if not QSystemTrayIcon.isSystemTrayAvailable():
-            return
-        
-        self.tray = QSystemTrayIcon(self)
-        icon = self.style().standardIcon(QStyle.StandardPixmap.SP_DesktopIcon)
-        self.tray.setIcon(icon)
-        self.tray.setToolTip("STACK-PAD v2.7.0")
-        
-        tray_menu = QMenu()
-        
-        show_action = tray_menu.addAction("Show/Hide")
-        show_action.triggered.connect(self.toggle_visibility)
-        
-        lock_action = tray_menu.addAction("Lock Position")
-        lock_action.triggered.connect(self.toggle_lock)
-        
-        tray_menu.addSeparator()
+    def _write_ops(self, ops: list[dict]) -> bool:
+        try:
+            self._append_journal(ops)
+        except Exception as exc:
+            log.warning("Could not save %d settings change(s) to %s, retrying: %s", len(ops), self.journal_path, exc)
+            with self._cond:
+                if not self._pending:
+                    self._first_op_at = time.monotonic()
+                self._pending[:0] = ops
+                self._retry_at = time.monotonic() + self.RETRY_S
+                self.error = exc
+            return False
+        with self._cond:
+            self.error = None
+        if self._state is not None:
+            for op in ops:
+                self._state = apply_config_op(self._state, op)
+        return True
+    
+    def _append_journal(self, ops: list[dict]):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        payload = "".join(json.dumps(op, separators=(",", ":")) + "\n" for op in ops)
+        with open(self.journal_path, "a", encoding="utf-8") as journal:
+            journal.write(payload)
+            journal.flush()
+            os.fsync(journal.fileno())
+        self._journal_entries += len(ops)
+    
+    def _write_snapshot(self):
+        text = json.dumps(self._state, indent=2)
+        _atomic_write(self.config_path, text)
+        with open(self.journal_path, "w", encoding="utf-8"):
+            pass
+        self._journal_entries = 0
+        self.write_cache(self.source_digest(text.encode("utf-8"), b"", {}), self._state)
+
+class ConfigManager:
+    
+    def __init__(self, store: Optional[ConfigStore] = None):
+        self.config: Optional[AppConfig] = None
+        self.store = store if store is not None else ConfigStore(get_config_dir())
+        self.library: Optional[ProfileLibrary] = None
+        self.cache_hit = False
+        self.load_timings: dict[str, float] = {}
+    
+    def load(self) -> AppConfig:
+        self.cache_hit = False
+        self.load_timings = {}
+        state = None
+        started = time.perf_counter()
+        
+        def mark(phase: str):
+            nonlocal started
+            now = time.perf_counter()
+            self.load_timings[phase] = now - started
+            started = now
+        
+        preserve = False
+        try:
+            with _gc_paused():
+                state = self._load_state(mark)
+        except Exception as exc:
+            log.error("Could not load settings from %s, starting from the defaults: %s", self.store.config_path, exc)
+            try:
+                for path in self.store.set_aside():
+                    log.warning("Kept the unreadable settings as %s", path)
+            except OSError as move_exc:
+                log.error("Could not move the unreadable settings aside, they will not be overwritten: %s", move_exc)
+                preserve = True
+            self.config = self._create_default_config()
+            mark("default")
         
-        exit_action = tray_menu.addAction("Exit")
-        exit_action.triggered.connect(self.close)
+        if self.config.profile_library:
+            self.open_library(self.store.directory / self.config.profile_library)
+            mark("library")
         
-        self.tray.setContextMenu(tray_menu)
-        self.tray.activated.connect(self.on_tray_activated)
-        self.tray.show()
+        if preserve:
+            self.store.attach(None)
+        else:
+            self.store.attach(state if state is not None else self.config.model_dump())
+        return self.config
+    
+    def open_library(self, path: Path) -> Optional[ProfileLibrary]:
+        if self.library is not None:
+            self.library.close()
+        try:
+            self.library = ProfileLibrary(path)
+        except (OSError, ValueError) as exc:
+            log.warning("Could not open profile library %s, continuing without it: %s", path, exc)
+            self.library = None
+        self.config.registry.attach_library(self.library)
+        return self.library
+    
+    def export_library(self, path: Path) -> int:
+        profiles = [profile.model_dump() for profile in self.config.profiles]
+        ProfileLibrary.write(path, profiles)
+        return len(profiles)
+    
+    def _adopt(self, profile: "Profile"):
+        if not self.config.registry.owns(profile.profile_id):
+            self.add_profile(profile)
+    
+    def _load_state(self, mark) -> dict:
+        config_bytes, journal_bytes = self.store.read_sources()
+        mark("read")
+        digest = self.store.source_digest(config_bytes, journal_bytes, EMBEDDED_CONFIG)
+        mark("hash")
+        
+        cached = self.store.read_cache(digest)
+        mark("cache")
+        if cached is not None:
+            try:
+                self.config = construct_config(cached)
+                self.store.count_journal(journal_bytes)
+                self.cache_hit = True
+                mark("construct")
+                return cached
+            except Exception:
+                self.config = None
+        
+        data = self.store.parse(config_bytes, journal_bytes, EMBEDDED_CONFIG)
+        self.config = AppConfig(**data)
+        mark("validate")
+        state = self.config.model_dump()
+        self.store.write_cache_async(digest, state)
+        return state
+    
+    def timing_report(self) -> str:
+        path = "cache hit (model_construct)" if self.cache_hit else "full validation"
+        lines = [f"Config load: {path}"]
+        for phase, seconds in self.load_timings.items():
+            lines.append(f"  {phase:<10} {seconds * 1000:8.3f} ms")
+        lines.append(f"  {'total':<10} {sum(self.load_timings.values()) * 1000:8.3f} ms")
+        return "\n".join(lines)
+    
+    def save(self) -> bool:
+        if self.config is None:
+            return False
+        self.store.record({"op": "replace", "config": self.config.model_dump()})
+        return True
+    
+    def update_binding(self, profile: "Profile", key_name: str, binding: KeyBinding, page: int = 0):
+        self._adopt(profile)
+        if page == 0:
+            profile.bindings[key_name] = binding
+        else:
+            profile.pages[page - 1][key_name] = binding
+        op = {
+            "op": "binding",
+            "profile_id": profile.profile_id,
+            "key": key_name,
+            "binding": binding.model_dump(),
+        }
+        if page:
+            op["page"] = page
+        self.store.record(op)
+    
+    def add_page(self, profile: "Profile") -> int:
+        self._adopt(profile)
+        profile.pages.append({})
+        page = len(profile.pages)
+        self.store.record({"op": "add_page", "profile_id": profile.profile_id, "page": page})
+        return page
+    
+    def add_profile(self, profile: Profile) -> Profile:
+        self.config.registry.add(profile)
+        self.store.record({"op": "add_profile", "profile": profile.model_dump()})
+        return profile
+    
+    def remove_profile(self, profile_id: str) -> Optional[Profile]:
+        profile = self.config.registry.remove(profile_id)
+        if profile is not None:
+            self.store.record({"op": "remove_profile", "profile_id": profile_id})
+        return profile
+    
+    def rename_profile(self, profile_id: str, profile_name: str) -> Optional[Profile]:
+        profile = self.config.registry.get(profile_id)
+        if profile is None:
+            return None
+        self._adopt(profile)
+        self.config.registry.rename(profile_id, profile_name)
+        self.store.record({"op": "rename_profile", "profile_id": profile_id, "profile_name": profile_name})
+        return profile
+    
+    def flush(self, timeout: Optional[float] = 2.0) -> bool:
+        return self.store.flush(timeout)
+    
+    def close(self):
+        if self.library is not None:
+            self.library.close()
+        self.store.close()
+    
+    def _create_default_config(self) -> AppConfig:
+        return AppConfig(**EMBEDDED_CONFIG)
+
+class KeypadEngine:
+    
+    def __init__(self, config_manager: Optional[ConfigManager] = None):
+        self.config_manager = config_manager if config_manager is not None else ConfigManager()
+        self.config = self.config_manager.load()
+        self.current_profile: Optional[Profile] = self.config.get_default_profile()
+        self.keypad: Optional[KeypadModel] = KeypadModel(self.current_profile) if self.current_profile else None
+        self.current_page = 0
+        self.listeners: list = []
+        
+        self.dispatcher = InjectionDispatcher(limiter=self.config.rate_limiter())
+        self.triggers = TriggerRouter(self.dispatcher, self.resolve_slot, self.config.hotkeys)
+        self.control_server: Optional[ControlServer] = None
+        self.active_hotkeys = 0
+        self.repeat_jobs = RepeatJobManager(
+            lambda job: self.dispatcher.submit(job.key_name),
+            on_change=lambda: self.notify("jobs"),
+        )
+        self.control_commands = ControlCommands(
+            self.dispatcher, self.repeat_jobs, self.resolve_slot,
+            switch_profile=self.switch_profile,
+            show_page=self.show_page,
+        )
+        self.foreground = ForegroundWatcher(self.config.registry.for_app, self.load_app_profile)
+        self.call_in_gui = None
+        self._limit_warnings: set[tuple] = set()
+        if self.current_profile is not None:
+            self.check_rate_limits(self.current_profile)
+    
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+    
+    def notify(self, event: str):
+        for listener in self.listeners:
+            listener(event)
+    
+    def resolve_slot(self, key_name: str) -> Optional[KeyBinding]:
+        keypad = self.keypad
+        if keypad is None or key_name not in keypad.slots:
+            return None
+        return keypad.binding(self.current_page, key_name)
     
-    def position_bottom_right(self):
-        screen = QApplication.primaryScreen().geometry()
-        x = screen.width() - self.width() - 20
-        y = screen.height() - self.height() - 50
-        self.move(x, y)
+    def switch_profile(self, id_or_name: str) -> bool:
+        profile = self.config.registry.resolve(id_or_name)
+        if profile is None:
+            return False
+        self.load_profile(profile.profile_id)
+        return True
     
     def load_profile(self, profile_id: str):
         profile = self.config.get_profile(profile_id)
         if profile is None:
             return
         
+        self.current_page = 0
         self.current_profile = profile
-        
-        for key_name, btn in self.key_buttons.items():
-            if key_name in profile.bindings:
-                btn.update_binding(profile.bindings[key_name])
+        self.keypad = KeypadModel(profile)
+        self.check_rate_limits(profile)
+        self.notify("profile")
     
-    
-    def on_key_clicked(self, output_key: str):
-        if self.edit_mode:
-            key_name = None
-            for k, btn in self.key_buttons.items():
-                if btn.output_key == output_key:
-                    key_name = k
-                    break
-            
-            if key_name and self.current_profile:
-                binding = self.current_profile.bindings.get(key_name)
-                if binding:
-                    dialog = EditKeyDialog(key_name, binding, self)
-                    if dialog.exec():
-                        new_binding = dialog.get_binding()
-                        self.current_profile.bindings[key_name] = new_binding
-                        self.key_buttons[key_name].update_binding(new_binding)
-                        self.config_manager.save()
-        else:
-            send_key(output_key)
-    
-    def on_auto_repeat_clicked(self):
-        if self.auto_repeat_btn.isChecked():
-            current_interval = getattr(self, 'repeat_interval_ms', 1000)
-            dialog = RepeatKeyDialog(current_interval, self)
-            if dialog.exec() and dialog.selected_key:
-                self.current_repeat_key = dialog.selected_key
-                self.repeat_interval_ms = dialog.get_interval_ms()
-                self.start_global_repeat(dialog.selected_key, self.repeat_interval_ms)
-                self.repeat_control_btn.setChecked(True)
-                self.repeat_control_btn.setText("On")
-            else:
-                self.auto_repeat_btn.setChecked(False)
+    def load_app_profile(self, profile: Profile):
+        if self.call_in_gui is not None:
+            self.call_in_gui(self.load_profile, profile.profile_id)
         else:
-            self.stop_global_repeat()
+            self.load_profile(profile.profile_id)
     
-    def toggle_repeat_control(self):
-        if self.repeat_control_btn.isChecked():
-            if hasattr(self, 'current_repeat_key') and hasattr(self, 'repeat_interval_ms'):
-                if hasattr(self, 'global_repeat_timer') and self.global_repeat_timer and self.global_repeat_timer.isActive():
-                    pass
-                else:
-                    self.start_global_repeat(self.current_repeat_key, self.repeat_interval_ms)
-                self.repeat_control_btn.setText("On")
-            else:
-                self.auto_repeat_btn.setChecked(True)
-                self.on_auto_repeat_clicked()
-        else:
-            self.pause_global_repeat()
-            self.repeat_control_btn.setText("Off")
+    def show_page(self, page: int) -> bool:
+        if self.keypad is None or not 0 <= page < self.keypad.page_count:
+            return False
+        self.current_page = page
+        self.notify("page")
+        return True
     
-    def start_global_repeat(self, repeat_key: str, interval_ms: int = 1000):
-        self.stop_global_repeat()
-        
-        self.current_repeat_key = repeat_key
-        self.repeat_interval_ms = interval_ms
-        
-        timer = QTimer(self)
-        timer.timeout.connect(lambda: self.repeat_key_press(repeat_key))
-        timer.start(interval_ms)
-        
-        self.global_repeat_timer = timer
-        self.auto_repeat_btn.setText(f"Auto Repeat ({repeat_key})")
-    
-    def pause_global_repeat(self):
-        if hasattr(self, 'global_repeat_timer') and self.global_repeat_timer:
-            self.global_repeat_timer.stop()
-    
-    def stop_global_repeat(self):
-        if hasattr(self, 'global_repeat_timer') and self.global_repeat_timer:
-            self.global_repeat_timer.stop()
-            self.global_repeat_timer.deleteLater()
-            self.global_repeat_timer = None
-        
-        if hasattr(self, 'current_repeat_key'):
-            delattr(self, 'current_repeat_key')
-        
-        if hasattr(self, 'auto_repeat_btn'):
-            self.auto_repeat_btn.setChecked(False)
-            self.auto_repeat_btn.setText("Auto Repeat")
-        
-        if hasattr(self, 'repeat_control_btn'):
-            self.repeat_control_btn.setChecked(False)
-            self.repeat_control_btn.setText("Off")
+    def cycle_page(self, step: int = 1):
+        if self.keypad is not None:
+            self.show_page((self.current_page + step) % self.keypad.page_count)
     
-    def repeat_key_press(self, output_key: str):
-        send_key(output_key)
+    def add_page(self):
+        if self.current_profile is None:
+            return
+        page = self.config_manager.add_page(self.current_profile)
+        self.show_page(page)
     
-    def toggle_edit_mode(self):
-        self.edit_mode = self.edit_btn.isChecked()
-        if self.edit_mode:
-            self.edit_btn.setText("Edit Mode ON")
-        else:
-            self.edit_btn.setText("Edit Mode")
+    def cycle_profile(self, step: int = 1):
+        if self.current_profile is None:
+            return
+        profile = self.config.registry.neighbor(self.current_profile.profile_id, step)
+        if profile is not None and profile is not self.current_profile:
+            self.load_profile(profile.profile_id)
     
-    def toggle_lock(self):
-        self.position_locked = not self.position_locked
-        if self.position_locked:
-            self.lock_btn.setText("🔒")
-            self.lock_btn.setToolTip("Position Locked")
-        else:
-            self.lock_btn.setText("🔓")
-            self.lock_btn.setToolTip("Position Unlocked")
+    def update_binding(self, key_name: str, binding: KeyBinding):
+        if self.current_profile is not None:
+            self.config_manager.update_binding(self.current_profile, key_name, binding, self.current_page)
+            self.check_rate_limits(self.current_profile)
     
-    def toggle_minimize(self):
-        if self.is_minimized:
-            self.show_main_window()
-        else:
-            self.hide_to_button()
-    
-    def close_application(self):
-        reply = QMessageBox.question(
-            self, "Close Application",
-            "Do you want to close the application?",
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.No
+    def check_rate_limits(self, profile: Profile) -> list[tuple[int, str, str]]:
+        limiter = self.dispatcher.limiter
+        if limiter is None:
+            return []
+        unreachable = []
+        for page, bindings in enumerate((profile.bindings, *profile.pages)):
+            for key_name, binding in bindings.items():
+                plan = binding.plan
+                blocked = limiter.exceeds_burst(plan.presses) if plan is not None else None
+                if blocked is None:
+                    continue
+                unreachable.append((page, key_name, blocked))
+                warning = (profile.profile_id, page, key_name, binding)
+                if warning not in self._limit_warnings:
+                    self._limit_warnings.add(warning)
+                    log.warning(
+                        "Macro on %s (page %d) of profile %r needs more %s presses than the rate limit burst "
+                        "allows and will always be throttled", key_name, page + 1, profile.profile_name, blocked,
+                    )
+        return unreachable
+    
+    def press(self, key_name: str, clicked: bool = False) -> Optional[Future]:
+        binding = self.resolve_slot(key_name)
+        if binding is None:
+            return None
+        if binding.plan is not None:
+            return self.dispatcher.submit_plan(binding.plan, clicked=clicked)
+        return self.dispatcher.submit(binding.output_key, clicked=clicked)
+    
+    def start_repeat_job(self, repeat_key: str, interval_ms: int = 1000,
+                         max_count: Optional[int] = None,
+                         max_duration_s: Optional[float] = None,
+                         overrun_policy: str = "skip",
+                         burst_cap: int = RepeatJob.DEFAULT_BURST_CAP) -> RepeatJob:
+        return self.repeat_jobs.add_job(
+            repeat_key, interval_ms, max_count, max_duration_s, overrun_policy, burst_cap
         )
-        if reply == QMessageBox.Yes:
-            self.stop_global_repeat()
-            
-            if self.minimize_button:
-                self.minimize_button.hide()
-                self.minimize_button.deleteLater()
-            
-            QApplication.quit()
     
-    def hide_to_button(self):
-        self.saved_pos = self.pos()
-        
-        self.hide()
-        self.is_minimized = True
-        
-        self.minimize_button = QWidget()
-        self.minimize_button.setWindowFlags(
-            Qt.WindowStaysOnTopHint |
-            Qt.FramelessWindowHint |
-            Qt.Tool
+    def start_hotkeys(self) -> int:
+        if not self.triggers.mapping:
+            return 0
+        try:
+            self.triggers.add_source(PynputHotkeySource(list(self.triggers.mapping)))
+        except Exception as exc:
+            log.warning("Global hotkeys are disabled: %s", exc)
+            return 0
+        self.active_hotkeys = len(self.triggers.mapping)
+        return self.active_hotkeys
+    
+    def start_app_switching(self, source: Optional[ForegroundSource] = None) -> bool:
+        if source is None:
+            if sys.platform != "win32" or not self.config.registry.has_app_rules():
+                return False
+            source = WinEventForegroundSource()
+        try:
+            self.foreground.add_source(source)
+        except Exception as exc:
+            log.warning("Automatic profile switching is disabled: %s", exc)
+            return False
+        return True
+    
+    def start_control_server(self, address: str) -> str:
+        self.control_server = ControlServer(self.control_commands.execute, address)
+        return self.control_server.start()
+    
+    def shutdown(self):
+        self.repeat_jobs.stop_all()
+        self.triggers.stop()
+        self.foreground.stop()
+        if self.control_server is not None:
+            self.control_server.stop()
+        self.repeat_jobs.shutdown()
+        self.dispatcher.stop()
+        self.config_manager.close()
+
+class Tracer:
+    
+    def __init__(self, size: int = 65536):
+        self.size = size
+        self.names: list[str] = [""] * size
+        self.starts = array("d", bytes(8 * size))
+        self.durations = array("d", bytes(8 * size))
+        self.threads = array("Q", bytes(8 * size))
+        self.count = 0
+        self.origin = time.perf_counter()
+        self._next = itertools.count()
+    
+    def record(self, name: str, started: float, duration: float):
+        slot = next(self._next)
+        index = slot % self.size
+        self.names[index] = name
+        self.starts[index] = started
+        self.durations[index] = duration
+        self.threads[index] = threading.get_ident()
+        self.count = slot + 1
+    
+    def trace_events(self) -> list[dict]:
+        pid = os.getpid()
+        window = min(self.count, self.size)
+        first = self.count - window
+        events = []
+        for slot in range(first, self.count):
+            index = slot % self.size
+            events.append({
+                "name": self.names[index],
+                "cat": "stack-pad",
+                "ph": "X",
+                "ts": (self.starts[index] - self.origin) * 1e6,
+                "dur": self.durations[index] * 1e6,
+                "pid": pid,
+                "tid": self.threads[index],
+            })
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for tid in sorted({event["tid"] for event in events}):
+            events.append({
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": thread_names.get(tid, str(tid))},
+            })
+        return events
+    
+    def dump(self, path: Path):
+        _atomic_write(Path(path), json.dumps({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}))
+
+TRACE_TARGETS = (
+    (None, "send_key"),
+    (None, "_send_input_fallback"),
+    (None, "KeypadEngine.load_profile"),
+    (None, "RepeatJobManager._tick"),
+    ("stack_pad_gui", "KeyButton.update_binding"),
+    ("stack_pad_gui", "MainWindow.on_key_clicked"),
+)
+
+tracer: Optional[Tracer] = None
+
+def _traced(name: str, func):
+    record = tracer.record
+    clock = time.perf_counter
+    
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        started = clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record(name, started, clock() - started)
+    return wrapper
+
+def enable_tracing(path: Optional[str] = None, size: int = 65536) -> Tracer:
+    global tracer
+    if tracer is not None:
+        return tracer
+    tracer = Tracer(size)
+    for module_name, name in TRACE_TARGETS:
+        target = sys.modules.get(module_name or __name__)
+        if target is None:
+            continue
+        owner, _, attribute = name.rpartition(".")
+        if owner:
+            target = getattr(target, owner)
+        setattr(target, attribute, _traced(name, getattr(target, attribute)))
+    if path:
+        atexit.register(tracer.dump, Path(path))
+    return tracer
+
+class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+    _fields_ = [
+        ("cb", wintypes.DWORD),
+        ("PageFaultCount", wintypes.DWORD),
+        ("PeakWorkingSetSize", ctypes.c_size_t),
+        ("WorkingSetSize", ctypes.c_size_t),
+        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+        ("PagefileUsage", ctypes.c_size_t),
+        ("PeakPagefileUsage", ctypes.c_size_t),
+    ]
+
+def peak_rss_mb() -> Optional[float]:
+    if sys.platform == "win32":
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.c_void_p(kernel32.GetCurrentProcess())
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return None
+        return counters.PeakWorkingSetSize / 1048576
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1048576 if sys.platform == "darwin" else peak / 1024
+
+class StartupProfiler:
+    
+    def __init__(self, started: float):
+        self.last = started
+        self.timings: dict[str, float] = {}
+    
+    def mark(self, phase: str, at: Optional[float] = None):
+        now = time.perf_counter() if at is None else at
+        self.timings[phase] = now - self.last
+        self.last = now
+    
+    def report(self) -> str:
+        lines = ["Startup profile:"]
+        for phase, seconds in self.timings.items():
+            lines.append(f"  {phase:<12} {seconds * 1000:8.3f} ms")
+        lines.append(f"  {'total':<12} {sum(self.timings.values()) * 1000:8.3f} ms")
+        peak = peak_rss_mb()
+        if peak is not None:
+            lines.append(f"  {'peak RSS':<12} {peak:8.1f} MiB")
+        return "\n".join(lines)
+
+startup_profiler = StartupProfiler(_startup_started)
+startup_profiler.mark("imports", _startup_imported)
+startup_profiler.mark("module")
+
+def run_config_benchmark(rounds: int = 50) -> str:
+    manager = ConfigManager()
+    manager.load()
+    lines = [manager.timing_report()]
+    
+    config_bytes, journal_bytes = manager.store.read_sources()
+    data = manager.store.parse(config_bytes, journal_bytes, EMBEDDED_CONFIG)
+    dumped = AppConfig(**data).model_dump()
+    
+    with _gc_paused():
+        started = time.perf_counter()
+        for _ in range(rounds):
+            AppConfig(**data)
+        validate_ms = (time.perf_counter() - started) * 1000 / rounds
+        
+        started = time.perf_counter()
+        for _ in range(rounds):
+            construct_config(dumped)
+        construct_ms = (time.perf_counter() - started) * 1000 / rounds
+    
+    profiles = len(data.get("profiles", []))
+    bindings = sum(len(profile.get("bindings", {})) for profile in data.get("profiles", []))
+    lines.append(f"Library: {profiles} profiles, {bindings} bindings ({rounds} rounds)")
+    lines.append(f"  full validation  {validate_ms:8.3f} ms/load")
+    lines.append(f"  snapshot cache   {construct_ms:8.3f} ms/load")
+    if construct_ms > 0:
+        lines.append(f"  speedup          {validate_ms / construct_ms:8.1f}x")
+    return "\n".join(lines)
+
+def synthetic_library(profiles: int = 10000, pages: int = 2, distinct: int = 64) -> dict:
+    slots = get_f_key_list()
+    chords = list(CHORDS)
+    bindings = [
+        {
+            "label": f"Action {index}",
+            "color_tag": COLOR_TAGS[index % len(COLOR_TAGS)],
+            "output_key": chords[index % len(chords)],
+            "macro": [{"key": "Ctrl+F13", "action": "tap", "hold_ms": 25, "delay_ms": 10, "repeat": 2}] if index % 16 == 0 else [],
+        }
+        for index in range(distinct)
+    ]
+    
+    def page(seed: int) -> dict:
+        return {slot: dict(bindings[(seed * 7 + offset * 3) % distinct]) for offset, slot in enumerate(slots)}
+    
+    return {
+        "default_profile_id": "profile-0",
+        "profiles": [
+            {
+                "profile_id": f"profile-{index}",
+                "profile_name": f"Profile {index}",
+                "description": "",
+                "icon": "default",
+                "bindings": page(index),
+                "pages": [page(index + extra) for extra in range(1, pages)],
+                "match_apps": [],
+            }
+            for index in range(profiles)
+        ],
+    }
+
+def run_memory_benchmark(profiles: int = 10000, pages: int = 2, distinct: int = 64) -> str:
+    import tracemalloc
+    
+    data = json.loads(json.dumps(synthetic_library(profiles, pages, distinct)))
+    slots = get_f_key_list()
+    ids = [profile["profile_id"] for profile in data["profiles"]]
+    
+    layouts = (
+        ("pydantic models", lambda: AppConfig(**data)),
+        ("interned models", lambda: construct_config(data)),
+    )
+    lines = [
+        f"Library: {profiles} profiles x {pages} pages x {len(slots)} slots, {distinct} distinct bindings",
+        f"  {'layout':<16} {'MiB':>8} {'B/profile':>10} {'build ms':>10} {'lookup ns':>10}",
+    ]
+    for name, build in layouts:
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        built = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        del built
+        
+        gc.collect()
+        started = time.perf_counter()
+        built = build()
+        build_ms = (time.perf_counter() - started) * 1000
+        
+        def lookup(profile_id: str, page: int, slot: str, registry=built.registry) -> KeyBinding:
+            profile = registry.get(profile_id)
+            return (profile.bindings if page == 0 else profile.pages[page - 1])[slot]
+        rounds = 0
+        started = time.perf_counter()
+        for profile_id in ids:
+            for slot in slots:
+                lookup(profile_id, pages - 1, slot)
+                rounds += 1
+        lookup_ns = (time.perf_counter() - started) * 1e9 / rounds
+        del built
+        
+        lines.append(
+            f"  {name:<16} {size / 1048576:8.1f} {size / profiles:10.0f} {build_ms:10.1f} {lookup_ns:10.0f}"
         )
-        self.minimize_button.setAttribute(Qt.WA_TranslucentBackground, False)
-        self.minimize_button.setFixedSize(35, 35)
-        dark_red = "#8B0000"
-        self.minimize_button.setStyleSheet(f"""
-            QWidget {{
-                background-color: {dark_red};
-                border: 2px solid {dark_red};
-                border-radius: 17px;
-            }}
-        """)
-        
-        self.minimize_button.mousePressEvent = self.minimize_button_press
-        self.minimize_button.mouseMoveEvent = self.minimize_button_move
-        self.minimize_button.mouseReleaseEvent = self.minimize_button_release
-        
-        layout = QVBoxLayout(self.minimize_button)
-        layout.setContentsMargins(0, 0, 0, 0)
-        label = QLabel("👁")
-        label.setAlignment(Qt.AlignCenter)
-        label.setStyleSheet(f"color: {COLORS['text_primary']}; font-size: 16px; background: transparent;")
-        layout.addWidget(label)
-        
-        self.minimize_button.mouseDoubleClickEvent = lambda e: self.show_main_window()
-        
-        if hasattr(self, 'saved_pos'):
-            self.minimize_button.move(self.saved_pos)
-        else:
-            screen = QApplication.primaryScreen().geometry()
-            x = screen.width() - 50
-            y = screen.height() - 50
-            self.minimize_button.move(x, y)
-        
-        self.minimize_button.show()
-        self.minimize_button.raise_()
-        self.minimize_button.activateWindow()
-    
-    def show_main_window(self):
-        if self.minimize_button:
-            if self.minimize_button.isVisible():
-                self.saved_pos = self.minimize_button.pos()
-            self.minimize_button.hide()
-            self.minimize_button.deleteLater()
-            self.minimize_button = None
-        
-        self.is_minimized = False
-        
-        if hasattr(self, 'saved_pos'):
-            self.move(self.saved_pos)
-        self.show()
-        self.raise_()
-        self.activateWindow()
-    
-    def minimize_button_press(self, event):
-        if event.button() == Qt.LeftButton:
-            self.minimize_old_pos = event.globalPosition().toPoint()
-            self.minimize_click_start = event.globalPosition().toPoint()
-    
-    def minimize_button_move(self, event):
-        if hasattr(self, 'minimize_old_pos'):
-            delta = event.globalPosition().toPoint() - self.minimize_old_pos
-            self.minimize_button.move(self.minimize_button.pos() + delta)
-            self.minimize_old_pos = event.globalPosition().toPoint()
-    
-    def minimize_button_release(self, event):
-        if hasattr(self, 'minimize_old_pos'):
-            if hasattr(self, 'minimize_click_start'):
-                moved = (event.globalPosition().toPoint() - self.minimize_click_start).manhattanLength()
-                if moved < 5:
-                    self.show_main_window()
-                delattr(self, 'minimize_click_start')
-            delattr(self, 'minimize_old_pos')
-    
-    
-    def toggle_visibility(self):
-        if self.isVisible():
-            self.hide()
-        else:
-            self.show()
-            self.raise_()
-            self.activateWindow()
-    
-    def on_tray_activated(self, reason):
-        if reason == QSystemTrayIcon.DoubleClick:
-            self.toggle_visibility()
-    
-    def mousePressEvent(self, event):
-        if event.button() == Qt.LeftButton and not self.position_locked:
-            self.old_pos = event.globalPosition().toPoint()
-        super().mousePressEvent(event)
-    
-    def mouseMoveEvent(self, event):
-        if self.old_pos and not self.position_locked:
-            delta = event.globalPosition().toPoint() - self.old_pos
-            self.move(self.pos() + delta)
-            self.old_pos = event.globalPosition().toPoint()
-        super().mouseMoveEvent(event)
-    
-    def mouseReleaseEvent(self, event):
-        self.old_pos = None
-        super().mouseReleaseEvent(event)
-    
-    def closeEvent(self, event):
-        self.stop_global_repeat()
-        
-        if self.minimize_button:
-            self.minimize_button.hide()
-            self.minimize_button.deleteLater()
-        
-        if self.tray.isVisible():
-            QMessageBox.information(
-                self, "Keys Pad",
-                "The application will continue to run in the system tray.\n"
-                "To quit, choose Exit from the tray menu."
+    return "\n".join(lines)
+
+def run_library_benchmark(sizes: tuple[int, ...] = (1000, 10000, 50000), rounds: int = 1000) -> str:
+    lines = [
+        "Profile library: eager snapshot construct vs. memory-mapped index (first activation, then LRU hit)",
+        f"  {'profiles':>9} {'file MiB':>9} {'eager ms':>9} {'open ms':>9} {'first ms':>9} {'cached us':>10}"
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            data = synthetic_library(size)
+            path = Path(directory) / f"library-{size}.spl"
+            ProfileLibrary.write(path, data["profiles"])
+            text = json.dumps(data)
+            target = f"profile-{size // 2}"
+            
+            with _gc_paused():
+                started = time.perf_counter()
+                construct_config(json.loads(text)).get_profile(target)
+                eager_ms = (time.perf_counter() - started) * 1000
+            
+            started = time.perf_counter()
+            library = ProfileLibrary(path)
+            open_ms = (time.perf_counter() - started) * 1000
+            
+            started = time.perf_counter()
+            library.get(target)
+            first_ms = (time.perf_counter() - started) * 1000
+            
+            started = time.perf_counter()
+            for _ in range(rounds):
+                library.get(target)
+            cached_us = (time.perf_counter() - started) * 1e6 / rounds
+            library.close()
+            
+            lines.append(
+                f"  {size:>9} {path.stat().st_size / 1048576:9.1f} {eager_ms:9.1f} "
+                f"{open_ms:9.3f} {first_ms:9.3f} {cached_us:10.2f}"
             )
-            self.hide()
-            event.ignore()
-        else:
-            event.accept()
+    return "\n".join(lines)
 
+def run_control_benchmark(frames: int = 200, batch: int = 50) -> str:
+    import asyncio
+    backend = set_backend(RecordingBackend(max_events=frames * batch * 2 + 16))
+    dispatcher = InjectionDispatcher()
+    repeat_jobs = RepeatJobManager(lambda job: dispatcher.submit(job.key_name))
+    keypad = KeypadModel(AppConfig(**EMBEDDED_CONFIG).get_default_profile())
+    commands = ControlCommands(dispatcher, repeat_jobs, lambda slot: keypad.binding(0, slot))
+    server = ControlServer(commands.execute, "tcp:127.0.0.1:0")
+    host, port = server.start().split(":")[1:]
+    slots = keypad.slots
+    
+    async def drive(frame_size: int, frame_count: int) -> tuple[float, list[float]]:
+        reader, writer = await asyncio.open_connection(host, int(port), limit=ControlServer.FRAME_LIMIT)
+        round_trips = []
+        started = time.perf_counter()
+        for index in range(frame_count):
+            commands = [
+                {"op": "press", "slot": slots[(index + n) % len(slots)], "delay_ms": 0}
+                for n in range(frame_size)
+            ]
+            sent = time.perf_counter()
+            writer.write((json.dumps(commands) + "\n").encode())
+            await writer.drain()
+            await reader.readline()
+            round_trips.append(time.perf_counter() - sent)
+        await asyncio.wrap_future(dispatcher.flush())
+        elapsed = time.perf_counter() - started
+        writer.close()
+        return elapsed, round_trips
+    
+    lines = [f"Control server benchmark ({server.bound_address}, recording backend)"]
+    try:
+        for frame_size, frame_count in ((1, frames * batch // 10), (batch, frames)):
+            backend.clear()
+            elapsed, round_trips = asyncio.run(drive(frame_size, frame_count))
+            presses = frame_size * frame_count
+            round_trips.sort()
+            lines.append(f"  {frame_size:>4} cmd/frame  {presses:>6} presses  {presses / elapsed:10.0f} presses/s  "
+                         f"rtt p50 {round_trips[len(round_trips) // 2] * 1000:7.3f} ms  "
+                         f"injected {len(backend.snapshot()) // 2}")
+    finally:
+        server.stop()
+        repeat_jobs.shutdown()
+        dispatcher.stop()
+    return "\n".join(lines)
 
-def main():
-    app = QApplication(sys.argv)
-    app.setQuitOnLastWindowClosed(False)
+def hide_console():
+    if sys.platform == "win32":
+        kernel32.FreeConsole()
+
+def parse_args(argv: list[str]) -> tuple[argparse.Namespace, list[str]]:
+    parser = argparse.ArgumentParser(prog="STACK-PAD")
+    parser.add_argument(
+        "--backend",
+        default=os.environ.get("STACK_PAD_BACKEND", "auto"),
+        help=f"Key injection backend: {', '.join(BACKENDS)} (env: STACK_PAD_BACKEND)",
+    )
+    parser.add_argument(
+        "--bench-config",
+        action="store_true",
+        help="Print config load timings (full validation vs. snapshot cache) and exit",
+    )
+    parser.add_argument(
+        "--control",
+        metavar="ADDRESS",
+        default=os.environ.get("STACK_PAD_CONTROL"),
+        help="Serve the local control protocol on tcp:HOST:PORT, unix:PATH or pipe:NAME (env: STACK_PAD_CONTROL)",
+    )
+    parser.add_argument(
+        "--bench-control",
+        action="store_true",
+        help="Measure control-socket throughput against the recording backend and exit",
+    )
+    parser.add_argument(
+        "--bench-memory",
+        action="store_true",
+        help="Compare memory use of a synthetic 10k-profile library as validated pydantic models and interned models, and exit",
+    )
+    parser.add_argument(
+        "--bench-library",
+        action="store_true",
+        help="Compare eager loading with the memory-mapped profile library at several library sizes and exit",
+    )
+    parser.add_argument(
+        "--export-library",
+        metavar="PATH",
+        help="Write the configured profiles to an indexed profile library file at PATH and exit",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        default=os.environ.get("STACK_PAD_TRACE"),
+        help="Record hot-path spans and write them to PATH as a Chrome trace on exit (env: STACK_PAD_TRACE)",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Start normally, print a per-phase startup timing breakdown once deferred work is done, and exit",
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        default=os.environ.get("STACK_PAD_HEADLESS", "") not in ("", "0"),
+        help="Run hotkeys, repeat jobs and the control server without loading the Qt GUI (env: STACK_PAD_HEADLESS)",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="ID_OR_NAME",
+        help="Profile to load at startup instead of the configured default",
+    )
+    args, qt_args = parser.parse_known_args(argv[1:])
+    if args.backend.lower() not in BACKENDS:
+        parser.error(f"unknown backend '{args.backend}' (choose from {', '.join(BACKENDS)})")
+    return args, [argv[0]] + qt_args
+
+def open_engine(args: argparse.Namespace) -> KeypadEngine:
+    engine = KeypadEngine()
+    if args.profile and not engine.switch_profile(args.profile):
+        print(f"Unknown profile '{args.profile}', using '{engine.config.default_profile_id}'", file=sys.stderr)
+    return engine
+
+def run_headless(args: argparse.Namespace) -> int:
+    import signal
+    
+    engine = open_engine(args)
+    startup_profiler.mark("engine")
+    get_backend().warm()
+    engine.start_hotkeys()
+    engine.start_app_switching()
+    address = None
+    if args.control:
+        try:
+            address = engine.start_control_server(args.control)
+        except Exception as exc:
+            print(f"Could not listen on {args.control}: {exc}", file=sys.stderr)
+            engine.shutdown()
+            return 1
+    startup_profiler.mark("deferred")
+    
+    if args.profile_startup:
+        print(startup_profiler.report())
+        print(engine.config_manager.timing_report())
+        engine.shutdown()
+        return 0
     
-    window = MainWindow()
-    window.show()
+    stopped = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stopped.set())
+    profile_name = engine.current_profile.profile_name if engine.current_profile is not None else "-"
+    print(
+        f"STACK-PAD headless: profile '{profile_name}', "
+        f"{engine.active_hotkeys} hotkeys, control {address or 'off'} (Ctrl+C to quit)",
+        flush=True,
+    )
+    while not stopped.wait(0.5):
+        pass
+    engine.shutdown()
+    return 0
+
+def main():
+    args, qt_argv = parse_args(sys.argv)
+    gui = None
+    offline = args.bench_config or args.bench_control or args.bench_memory or args.bench_library or args.export_library
+    if not (args.headless or offline):
+        import stack_pad_gui as gui
+        startup_profiler.mark("gui import")
+    if args.trace:
+        enable_tracing(args.trace)
+    if args.bench_config:
+        print(run_config_benchmark())
+        return
+    if args.bench_control:
+        print(run_control_benchmark())
+        return
+    if args.bench_memory:
+        print(run_memory_benchmark())
+        return
+    if args.bench_library:
+        print(run_library_benchmark())
+        return
+    if args.export_library:
+        manager = ConfigManager()
+        manager.load()
+        count = manager.export_library(Path(args.export_library))
+        manager.close()
+        print(f"Wrote {count} profiles to {args.export_library}")
+        return
     
-    sys.exit(app.exec())
+    select_backend(args.backend)
+    startup_profiler.mark("args")
+    sys.exit(gui.run(args, qt_argv) if gui is not None else run_headless(args))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,1358 @@
+from pathlib import Path
+from typing import Optional
+from concurrent.futures import Future
+
+from PySide6.QtWidgets import (
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+    QGridLayout, QPushButton, QLabel, QComboBox, QLineEdit, QDialog,
+    QDialogButtonBox, QFormLayout, QMessageBox, QSystemTrayIcon, QMenu, QStyle, QCheckBox,
+    QPlainTextEdit, QFileDialog
+)
+from PySide6.QtCore import Qt, QPoint, QTimer, Signal
+from PySide6.QtGui import QIcon, QColor, QPixmap, QCursor, QKeySequence, QShortcut
+
+from STACK_PAD import (
+    CHORDS, COLOR_TAGS, MODIFIER_VK, KeyBinding, KeypadEngine, Metrics, RepeatJob,
+    chord_name, default_binding, get_backend, get_f_key_list, hide_console,
+    metrics, open_engine, startup_profiler,
+)
+
+COLORS = {
+    "bg_primary": "#1e1e1e",
+    "bg_secondary": "#252525",
+    "bg_tertiary": "#2d2d2d",
+    "text_primary": "#ffffff",
+    "text_secondary": "#b0b0b0",
+    "accent_cyan": "#00d4ff",
+    "accent_purple": "#9d4edd",
+    "accent_green": "#06d6a0",
+    "accent_orange": "#ff9e00",
+    "accent_red": "#ef476f",
+    "accent_blue": "#118ab2",
+    "accent_yellow": "#ffd60a",
+    "accent_gray": "#6c757d",
+    "border": "#3a3a3a",
+    "hover": "#353535",
+}
+
+_swatch_icons: dict[str, QIcon] = {}
+
+def swatch_icon(color: str) -> QIcon:
+    icon = _swatch_icons.get(color)
+    if icon is None:
+        pixmap = QPixmap(20, 20)
+        pixmap.fill(QColor(color))
+        icon = QIcon(pixmap)
+        _swatch_icons[color] = icon
+    return icon
+
+THEMES = {
+    "dark": dict(COLORS),
+    "light": {
+        "bg_primary": "#f4f4f4",
+        "bg_secondary": "#ffffff",
+        "bg_tertiary": "#e8e8e8",
+        "text_primary": "#1e1e1e",
+        "text_secondary": "#5c5c5c",
+        "accent_cyan": "#0096b4",
+        "accent_purple": "#7b2cbf",
+        "accent_green": "#05a57b",
+        "accent_orange": "#e07b00",
+        "accent_red": "#d62850",
+        "accent_blue": "#0e6f91",
+        "accent_yellow": "#c9a400",
+        "accent_gray": "#6c757d",
+        "border": "#cfcfcf",
+        "hover": "#e6e6e6",
+    },
+}
+
+def set_style_property(widget: QWidget, name: str, value) -> bool:
+    if widget.property(name) == value:
+        return False
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    return True
+
+class ThemeEngine:
+    
+    def __init__(self, themes: dict[str, dict[str, str]] = THEMES):
+        self.themes = themes
+        self.current: Optional[str] = None
+        self._compiled: dict[str, str] = {}
+    
+    def stylesheet(self, name: str) -> str:
+        sheet = self._compiled.get(name)
+        if sheet is None:
+            sheet = self._compile(self.themes[name])
+            self._compiled[name] = sheet
+        return sheet
+    
+    def ensure_applied(self, name: str = "dark"):
+        if self.current is None:
+            self.apply(name)
+    
+    def apply(self, name: str, app: Optional[QApplication] = None) -> bool:
+        if name not in self.themes:
+            raise ValueError(f"Unknown theme: {name}")
+        if name == self.current:
+            return False
+        app = app or QApplication.instance()
+        COLORS.update(self.themes[name])
+        app.setStyleSheet(self.stylesheet(name))
+        self.current = name
+        return True
+    
+    def _compile(self, c: dict[str, str]) -> str:
+        accents = {tag: c[f"accent_{tag}"] for tag in COLOR_TAGS}
+        key_rules = "".join(f"""
+        QPushButton[role="key"][color_tag="{tag}"] {{
+            border-color: {color};
+        }}
+        QPushButton[role="key"][color_tag="{tag}"]:pressed {{
+            background-color: {color};
+            color: {c["bg_primary"]};
+        }}""" for tag, color in accents.items())
+        
+        return f"""
+        QMainWindow {{
+            background-color: {c["bg_primary"]};
+        }}
+        QWidget {{
+            background-color: {c["bg_primary"]};
+            color: {c["text_primary"]};
+        }}
+        QLabel {{
+            color: {c["text_primary"]};
+        }}
+        QLineEdit, QComboBox {{
+            background-color: {c["bg_secondary"]};
+            border: 1px solid {c["border"]};
+            border-radius: 4px;
+            padding: 6px;
+            color: {c["text_primary"]};
+        }}
+        QLineEdit:focus, QComboBox:focus {{
+            border-color: {c["accent_cyan"]};
+        }}
+        QLabel#titleLabel {{
+            font-size: 12px;
+            font-weight: bold;
+            color: {c["accent_cyan"]};
+        }}
+        QLabel#versionLabel {{
+            font-size: 9px;
+            color: {c["text_secondary"]};
+        }}
+        QLabel#copyrightLabel {{
+            font-size: 8px;
+            color: {c["text_secondary"]};
+        }}
+        QPushButton[role="tool"] {{
+            background-color: {c["bg_secondary"]};
+            border: 1px solid {c["border"]};
+            border-radius: 4px;
+        }}
+        QPushButton[role="tool"]:hover {{
+            background-color: {c["hover"]};
+        }}
+        QPushButton#closeButton {{
+            color: {c["accent_red"]};
+        }}
+        QPushButton#closeButton:hover {{
+            background-color: {c["accent_red"]};
+            color: {c["text_primary"]};
+        }}
+        QPushButton[role="key"] {{
+            background-color: {c["bg_secondary"]};
+            border: 2px solid {c["accent_gray"]};
+            border-radius: 8px;
+            color: {c["text_primary"]};
+            font-size: 10px;
+            font-weight: 500;
+            padding: 4px;
+        }}
+        QPushButton[role="key"]:hover {{
+            background-color: {c["hover"]};
+        }}{key_rules}
+        QPushButton[role="toggle"] {{
+            background-color: {c["bg_secondary"]};
+            border: 1px solid {c["border"]};
+            border-radius: 4px;
+            padding: 4px 8px;
+        }}
+        QPushButton[role="toggle"]:hover {{
+            background-color: {c["hover"]};
+        }}
+        QPushButton[role="toggle"][accent="cyan"]:checked {{
+            background-color: {c["accent_cyan"]};
+            color: {c["bg_primary"]};
+        }}
+        QPushButton[role="toggle"][accent="red"]:checked {{
+            background-color: {c["accent_red"]};
+            color: {c["text_primary"]};
+        }}
+        QPushButton[role="toggle"][accent="green"]:checked {{
+            background-color: {c["accent_green"]};
+            color: {c["text_primary"]};
+        }}
+        QPushButton#stopJobButton:hover {{
+            background-color: {c["accent_red"]};
+        }}
+        QComboBox#jobsCombo {{
+            padding: 2px 6px;
+            font-size: 10px;
+        }}
+        QDialog {{
+            background-color: {c["bg_primary"]};
+            color: {c["text_primary"]};
+        }}
+        QDialog#repeatDialog QPushButton {{
+            background-color: {c["bg_secondary"]};
+            border: 1px solid {c["border"]};
+            border-radius: 4px;
+            padding: 8px;
+            color: {c["text_primary"]};
+            min-width: 60px;
+        }}
+        QDialog#repeatDialog QPushButton:hover {{
+            background-color: {c["hover"]};
+            border-color: {c["accent_cyan"]};
+        }}
+        QDialog#repeatDialog QPushButton#turboButton {{
+            background-color: {c["accent_red"]};
+            font-weight: bold;
+        }}
+        QLabel[role="heading"] {{
+            font-size: 12px;
+            font-weight: bold;
+        }}
+        QLabel[role="hint"] {{
+            font-size: 10px;
+            color: {c["text_secondary"]};
+        }}
+        QPlainTextEdit#metricsReport {{
+            font-family: Consolas, "DejaVu Sans Mono", monospace;
+            font-size: 11px;
+        }}
+        QLabel#selectedKeyLabel {{
+            font-size: 11px;
+            color: {c["accent_cyan"]};
+        }}
+        QLabel#selectedKeyLabel[selected="true"] {{
+            color: {c["accent_green"]};
+        }}
+        QWidget#minimizeButton {{
+            background-color: #8B0000;
+            border: 2px solid #8B0000;
+            border-radius: 17px;
+        }}
+        QWidget#minimizeButton QLabel {{
+            color: {c["text_primary"]};
+            font-size: 16px;
+            background: transparent;
+        }}
+        """
+
+theme_engine = ThemeEngine()
+
+class KeyButton(QPushButton):
+    
+    clicked_signal = Signal(str)
+    
+    def __init__(self, key_name: str, binding: KeyBinding, parent=None):
+        super().__init__(parent)
+        self.key_name = key_name
+        self.binding = binding
+        self.output_key = binding.output_key
+        
+        self.setMinimumSize(90, 50)
+        self.setMaximumSize(90, 50)
+        self.setCursor(QCursor(Qt.PointingHandCursor))
+        self.setProperty("role", "key")
+        
+        self.update_display()
+        self.clicked.connect(lambda: self.clicked_signal.emit(self.key_name))
+    
+    def update_display(self):
+        self.update_style()
+        self.update_text()
+    
+    def update_style(self):
+        set_style_property(self, "color_tag", self.binding.color_tag)
+    
+    def update_text(self):
+        label = self.binding.label if self.binding.label else self.key_name
+        self.setText(label)
+        if self.binding.macro:
+            self.setToolTip(f"{self.key_name} → macro ({len(self.binding.macro)} steps)\n{label}")
+        else:
+            self.setToolTip(f"{self.key_name} → {self.output_key}\n{label}")
+    
+    def differs_from(self, binding: KeyBinding) -> bool:
+        current = self.binding
+        return (
+            current.label != binding.label
+            or current.color_tag != binding.color_tag
+            or current.output_key != binding.output_key
+            or current.macro != binding.macro
+        )
+    
+    def update_binding(self, binding: KeyBinding) -> bool:
+        previous = self.binding
+        changed = self.differs_from(binding)
+        self.binding = binding
+        self.output_key = binding.output_key
+        
+        if previous.color_tag != binding.color_tag:
+            self.update_style()
+        if (previous.label != binding.label or previous.output_key != binding.output_key
+                or previous.macro != binding.macro):
+            self.update_text()
+        return changed
+
+class EditKeyDialog(QDialog):
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.key_name = ""
+        self.binding: Optional[KeyBinding] = None
+        
+        self.setMinimumWidth(300)
+        
+        layout = QFormLayout(self)
+        
+        self.key_label = QLabel()
+        layout.addRow("", self.key_label)
+        
+        self.label_input = QLineEdit()
+        self.label_input.setMaxLength(18)
+        layout.addRow("Label:", self.label_input)
+        
+        color_layout = QHBoxLayout()
+        self.color_combo = QComboBox()
+        self.color_combo.setMinimumWidth(200)
+        color_layout.addWidget(self.color_combo)
+        
+        layout.addRow("Color:", color_layout)
+        self.populate_color_combo()
+        
+        modifier_layout = QHBoxLayout()
+        self.modifier_checks: dict[str, QCheckBox] = {}
+        for modifier in MODIFIER_VK:
+            check = QCheckBox(modifier)
+            check.toggled.connect(self.update_key_label)
+            modifier_layout.addWidget(check)
+            self.modifier_checks[modifier] = check
+        modifier_layout.addStretch()
+        layout.addRow("Modifiers:", modifier_layout)
+        
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+    
+    def set_binding(self, key_name: str, binding: KeyBinding):
+        self.key_name = key_name
+        self.binding = binding
+        
+        self.setWindowTitle(f"Edit {key_name}")
+        modifiers = CHORDS[binding.output_key][0]
+        for modifier, check in self.modifier_checks.items():
+            check.blockSignals(True)
+            check.setChecked(modifier in modifiers)
+            check.blockSignals(False)
+        self.update_key_label()
+        self.label_input.setText(binding.label)
+        self.label_input.setFocus()
+        
+        self.populate_color_combo()
+        index = self.color_combo.findData(binding.color_tag)
+        self.color_combo.setCurrentIndex(max(index, 0))
+    
+    def get_output_key(self) -> str:
+        modifiers = [modifier for modifier, check in self.modifier_checks.items() if check.isChecked()]
+        return chord_name(modifiers, CHORDS[self.binding.output_key][1])
+    
+    def update_key_label(self):
+        self.key_label.setText(f"Key: {self.key_name} → {self.get_output_key()}")
+    
+    def populate_color_combo(self):
+        self.color_combo.clear()
+        for tag in COLOR_TAGS:
+            self.add_color_item(tag, COLORS[f"accent_{tag}"])
+    
+    def add_color_item(self, tag: str, color: str):
+        self.color_combo.addItem(swatch_icon(color), tag, tag)
+    
+    def get_binding(self) -> KeyBinding:
+        return KeyBinding(
+            label=self.label_input.text(),
+            color_tag=self.color_combo.currentData() or self.color_combo.currentText(),
+            output_key=self.get_output_key(),
+            macro=self.binding.macro,
+        )
+
+class RepeatKeyDialog(QDialog):
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.selected_key = None
+        self.interval_ms = 1000
+        
+        self.setWindowTitle("Auto Repeat Settings")
+        self.setMinimumWidth(350)
+        self.setMinimumHeight(450)
+        self.setObjectName("repeatDialog")
+        
+        layout = QVBoxLayout(self)
+        
+        key_label = QLabel("Select Key to Repeat:")
+        key_label.setProperty("role", "heading")
+        layout.addWidget(key_label)
+        
+        grid = QGridLayout()
+        grid.setSpacing(5)
+        
+        f_keys = get_f_key_list()
+        for idx, key_name in enumerate(f_keys):
+            row = idx // 3
+            col = idx % 3
+            btn = QPushButton(key_name)
+            btn.clicked.connect(lambda checked, k=key_name: self.select_key(k))
+            grid.addWidget(btn, row, col)
+        
+        layout.addLayout(grid)
+        
+        self.selected_key_label = QLabel("Selected: None")
+        self.selected_key_label.setObjectName("selectedKeyLabel")
+        layout.addWidget(self.selected_key_label)
+        
+        layout.addSpacing(10)
+        
+        speed_label = QLabel("Repeat Speed:")
+        speed_label.setProperty("role", "heading")
+        layout.addWidget(speed_label)
+        
+        unit_layout = QHBoxLayout()
+        unit_layout.addWidget(QLabel("Unit:"))
+        self.unit_combo = QComboBox()
+        self.unit_combo.addItems(["Milliseconds", "Seconds", "Minutes", "Hours"])
+        self.unit_combo.setCurrentText("Seconds")
+        self.unit_combo.currentTextChanged.connect(self.update_interval)
+        unit_layout.addWidget(self.unit_combo)
+        layout.addLayout(unit_layout)
+        
+        value_layout = QHBoxLayout()
+        value_layout.addWidget(QLabel("Value:"))
+        self.value_input = QLineEdit("1.0")
+        self.value_input.setPlaceholderText("Enter value")
+        self.value_input.textChanged.connect(self.update_interval)
+        value_layout.addWidget(self.value_input)
+        layout.addLayout(value_layout)
+        
+        preset_label = QLabel("Presets:")
+        layout.addWidget(preset_label)
+        preset_layout = QHBoxLayout()
+        
+        turbo_btn = QPushButton("Turbo")
+        turbo_btn.setObjectName("turboButton")
+        turbo_btn.clicked.connect(lambda: self.set_preset("0.001", "Seconds"))
+        preset_layout.addWidget(turbo_btn)
+        
+        for label, value, unit in [("Fast", "0.1", "Seconds"), ("Normal", "1", "Seconds"), ("Slow", "5", "Seconds")]:
+            btn = QPushButton(label)
+            btn.clicked.connect(lambda checked, v=value, u=unit: self.set_preset(v, u))
+            preset_layout.addWidget(btn)
+        
+        layout.addLayout(preset_layout)
+        
+        self.interval_label = QLabel()
+        self.interval_label.setProperty("role", "hint")
+        self.update_interval()
+        layout.addWidget(self.interval_label)
+        
+        layout.addSpacing(10)
+        
+        limit_label = QLabel("Stop After (leave empty to run until stopped):")
+        limit_label.setProperty("role", "heading")
+        layout.addWidget(limit_label)
+        
+        limit_layout = QHBoxLayout()
+        limit_layout.addWidget(QLabel("Presses:"))
+        self.count_input = QLineEdit()
+        self.count_input.setPlaceholderText("∞")
+        limit_layout.addWidget(self.count_input)
+        limit_layout.addWidget(QLabel("Seconds:"))
+        self.duration_input = QLineEdit()
+        self.duration_input.setPlaceholderText("∞")
+        limit_layout.addWidget(self.duration_input)
+        layout.addLayout(limit_layout)
+        
+        overrun_layout = QHBoxLayout()
+        overrun_layout.addWidget(QLabel("If it can't keep up:"))
+        self.overrun_combo = QComboBox()
+        self.overrun_combo.addItem("Skip missed", "skip")
+        self.overrun_combo.addItem("Coalesce", "coalesce")
+        self.overrun_combo.addItem("Burst catch-up", "burst")
+        self.overrun_combo.currentIndexChanged.connect(
+            lambda _index: self.burst_cap_input.setEnabled(self.get_overrun_policy() == "burst")
+        )
+        overrun_layout.addWidget(self.overrun_combo)
+        overrun_layout.addWidget(QLabel("Cap:"))
+        self.burst_cap_input = QLineEdit(str(RepeatJob.DEFAULT_BURST_CAP))
+        self.burst_cap_input.setMaximumWidth(50)
+        self.burst_cap_input.setEnabled(False)
+        overrun_layout.addWidget(self.burst_cap_input)
+        layout.addLayout(overrun_layout)
+        
+        layout.addStretch()
+        
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch()
+        
+        ok_btn = QPushButton("OK")
+        ok_btn.clicked.connect(self.accept_dialog)
+        btn_layout.addWidget(ok_btn)
+        
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(cancel_btn)
+        
+        layout.addLayout(btn_layout)
+    
+    def reset(self):
+        self.selected_key = None
+        self.selected_key_label.setText("Selected: None")
+        set_style_property(self.selected_key_label, "selected", "false")
+        self.set_preset("1.0", "Seconds")
+        self.count_input.clear()
+        self.duration_input.clear()
+        self.overrun_combo.setCurrentIndex(0)
+        self.burst_cap_input.setText(str(RepeatJob.DEFAULT_BURST_CAP))
+    
+    def select_key(self, key_name: str):
+        self.selected_key = key_name
+        self.selected_key_label.setText(f"Selected: {key_name}")
+        set_style_property(self.selected_key_label, "selected", "true")
+    
+    def set_preset(self, value: str, unit: str):
+        self.value_input.setText(value)
+        self.unit_combo.setCurrentText(unit)
+    
+    def update_interval(self):
+        try:
+            value = float(self.value_input.text() or "1.0")
+            unit = self.unit_combo.currentText()
+            
+            if unit == "Milliseconds":
+                interval_ms = int(value)
+            elif unit == "Seconds":
+                interval_ms = int(value * 1000)
+            elif unit == "Minutes":
+                interval_ms = int(value * 60 * 1000)
+            elif unit == "Hours":
+                interval_ms = int(value * 60 * 60 * 1000)
+            else:
+                interval_ms = 1000
+            
+            interval_ms = max(1, min(interval_ms, 216000000))
+            
+            self.interval_ms = interval_ms
+            
+            if interval_ms < 1000:
+                self.interval_label.setText(f"Interval: {interval_ms} ms")
+            elif interval_ms < 60000:
+                self.interval_label.setText(f"Interval: {interval_ms/1000:.3f} seconds")
+            elif interval_ms < 3600000:
+                self.interval_label.setText(f"Interval: {interval_ms/60000:.2f} minutes")
+            else:
+                self.interval_label.setText(f"Interval: {interval_ms/3600000:.2f} hours")
+        except ValueError:
+            self.interval_label.setText("Invalid value")
+    
+    def accept_dialog(self):
+        if not self.selected_key:
+            QMessageBox.warning(self, "No Key Selected", "Please select a key to repeat.")
+            return
+        
+        try:
+            self.get_max_count()
+            self.get_max_duration_s()
+            self.get_burst_cap()
+        except ValueError:
+            QMessageBox.warning(self, "Invalid Limit", "Stop-after limits and the burst cap must be positive numbers.")
+            return
+        
+        self.accept()
+    
+    def get_interval_ms(self) -> int:
+        return self.interval_ms
+    
+    def get_max_count(self) -> Optional[int]:
+        text = self.count_input.text().strip()
+        if not text:
+            return None
+        value = int(text)
+        if value <= 0:
+            raise ValueError(text)
+        return value
+    
+    def get_max_duration_s(self) -> Optional[float]:
+        text = self.duration_input.text().strip()
+        if not text:
+            return None
+        value = float(text)
+        if value <= 0:
+            raise ValueError(text)
+        return value
+    
+    def get_overrun_policy(self) -> str:
+        return self.overrun_combo.currentData()
+    
+    def get_burst_cap(self) -> int:
+        value = int(self.burst_cap_input.text().strip() or RepeatJob.DEFAULT_BURST_CAP)
+        if value <= 0:
+            raise ValueError(value)
+        return value
+
+class MetricsDialog(QDialog):
+    
+    def __init__(self, metrics: Metrics, parent=None):
+        super().__init__(parent)
+        self.metrics = metrics
+        
+        self.setWindowTitle("Statistics")
+        self.setMinimumSize(520, 300)
+        
+        layout = QVBoxLayout(self)
+        
+        self.report_view = QPlainTextEdit()
+        self.report_view.setObjectName("metricsReport")
+        self.report_view.setReadOnly(True)
+        layout.addWidget(self.report_view)
+        
+        btn_layout = QHBoxLayout()
+        
+        export_btn = QPushButton("Export JSON…")
+        export_btn.clicked.connect(self.export_json)
+        btn_layout.addWidget(export_btn)
+        
+        reset_btn = QPushButton("Reset")
+        reset_btn.clicked.connect(self.reset_metrics)
+        btn_layout.addWidget(reset_btn)
+        
+        btn_layout.addStretch()
+        
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.hide)
+        btn_layout.addWidget(close_btn)
+        
+        layout.addLayout(btn_layout)
+        
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+    
+    def showEvent(self, event):
+        self.refresh()
+        self.refresh_timer.start(1000)
+        super().showEvent(event)
+    
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+    
+    def refresh(self):
+        self.report_view.setPlainText(self.metrics.report())
+    
+    def reset_metrics(self):
+        self.metrics.reset()
+        self.refresh()
+    
+    def export_json(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Statistics", "stack-pad-metrics.json", "JSON (*.json)"
+        )
+        if not path:
+            return
+        try:
+            self.metrics.export_json(Path(path))
+        except OSError as exc:
+            QMessageBox.warning(self, "Export Failed", str(exc))
+
+class MainWindow(QMainWindow):
+    
+    engine_changed = Signal(str)
+    gui_call = Signal(object)
+    
+    def __init__(self, engine: KeypadEngine):
+        super().__init__()
+        self.engine = engine
+        self.edit_mode = False
+        self.position_locked = False
+        self.old_pos = None
+        self.is_minimized = False
+        
+        self.gui_call.connect(self.run_gui_call)
+        self.engine_changed.connect(self.on_engine_changed)
+        engine.subscribe(self.engine_changed.emit)
+        engine.control_commands.call_in_gui = self.call_in_gui
+        engine.call_in_gui = self.call_in_gui
+        
+        self.repeat_stats_timer = QTimer(self)
+        self.repeat_stats_timer.timeout.connect(self.refresh_repeat_jobs)
+        
+        self.minimize_button: Optional[QWidget] = None
+        self.edit_dialog: Optional[EditKeyDialog] = None
+        self.repeat_dialog: Optional[RepeatKeyDialog] = None
+        self.metrics_dialog: Optional[MetricsDialog] = None
+        
+        self.repeat_interval_ms = 1000
+        
+        theme_engine.ensure_applied()
+        self.tray = None
+        self.init_ui()
+        self.update_page_controls()
+    
+    def finish_startup(self):
+        self.init_tray()
+        get_backend().warm()
+        self.engine.start_hotkeys()
+        self.engine.start_app_switching()
+    
+    def call_in_gui(self, action, *args) -> Future:
+        future: Future = Future()
+        self.gui_call.emit((future, action, args))
+        return future
+    
+    def run_gui_call(self, call):
+        future, action, args = call
+        try:
+            future.set_result(action(*args))
+        except Exception as exc:
+            future.set_exception(exc)
+    
+    def on_engine_changed(self, event: str):
+        if event == "jobs":
+            self.refresh_repeat_jobs()
+            return
+        keypad = self.engine.keypad
+        if keypad is not None:
+            self.apply_bindings(keypad.page_bindings(self.engine.current_page))
+        self.update_page_controls()
+        if event == "profile" and self.tray is not None and self.engine.current_profile is not None:
+            self.tray.setToolTip(f"STACK-PAD v2.7.0 - {self.engine.current_profile.profile_name}")
+    
+    def init_ui(self):
+        self.setWindowTitle("STACK-PAD v2.7.0")
+        self.setWindowFlags(
+            Qt.WindowStaysOnTopHint |
+            Qt.FramelessWindowHint |
+            Qt.Tool
+        )
+        self.setAttribute(Qt.WA_TranslucentBackground, False)
+        
+        self.setFixedSize(320, 372)
+        self.position_bottom_right()
+        
+        main_widget = QWidget()
+        self.setCentralWidget(main_widget)
+        main_layout = QVBoxLayout(main_widget)
+        main_layout.setContentsMargins(10, 10, 10, 10)
+        main_layout.setSpacing(8)
+        
+        self.top_bar = self.create_top_bar()
+        main_layout.addWidget(self.top_bar)
+        
+        self.key_grid = self.create_key_grid()
+        main_layout.addWidget(self.key_grid)
+        
+        self.bottom_bar = self.create_bottom_bar()
+        main_layout.addWidget(self.bottom_bar)
+        
+        next_profile_shortcut = QShortcut(QKeySequence("Ctrl+PgDown"), self)
+        next_profile_shortcut.activated.connect(lambda: self.engine.cycle_profile(1))
+        previous_profile_shortcut = QShortcut(QKeySequence("Ctrl+PgUp"), self)
+        previous_profile_shortcut.activated.connect(lambda: self.engine.cycle_profile(-1))
+        
+        next_page_shortcut = QShortcut(QKeySequence("PgDown"), self)
+        next_page_shortcut.activated.connect(lambda: self.engine.cycle_page(1))
+        previous_page_shortcut = QShortcut(QKeySequence("PgUp"), self)
+        previous_page_shortcut.activated.connect(lambda: self.engine.cycle_page(-1))
+        for page in range(9):
+            page_shortcut = QShortcut(QKeySequence(f"Alt+{page + 1}"), self)
+            page_shortcut.activated.connect(lambda page=page: self.engine.show_page(page))
+    
+    def create_top_bar(self) -> QWidget:
+        bar = QWidget()
+        layout = QHBoxLayout(bar)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(8)
+        
+        left_layout = QVBoxLayout()
+        left_layout.setSpacing(2)
+        
+        title_label = QLabel("STACK-PAD")
+        title_label.setObjectName("titleLabel")
+        left_layout.addWidget(title_label)
+        
+        version_copyright_layout = QHBoxLayout()
+        version_copyright_layout.setSpacing(5)
+        
+        version_label = QLabel("v2.7.0")
+        version_label.setObjectName("versionLabel")
+        version_copyright_layout.addWidget(version_label)
+        
+        copyright_label = QLabel("Dev.Essam / GitHub ( s0-5 ) © 2026")
+        copyright_label.setObjectName("copyrightLabel")
+        version_copyright_layout.addWidget(copyright_label)
+        version_copyright_layout.addStretch()
+        
+        left_layout.addLayout(version_copyright_layout)
+        layout.addLayout(left_layout)
+        
+        layout.addStretch()
+        
+        self.lock_btn = QPushButton("🔒")
+        self.lock_btn.setFixedSize(30, 30)
+        self.lock_btn.setToolTip("Lock/Unlock Position")
+        self.lock_btn.setProperty("role", "tool")
+        self.lock_btn.clicked.connect(self.toggle_lock)
+        layout.addWidget(self.lock_btn)
+        
+        self.minimize_btn = QPushButton("👁")
+        self.minimize_btn.setFixedSize(30, 30)
+        self.minimize_btn.setToolTip("Hide/Show Application")
+        self.minimize_btn.setProperty("role", "tool")
+        self.minimize_btn.clicked.connect(self.toggle_minimize)
+        layout.addWidget(self.minimize_btn)
+        
+        self.close_btn = QPushButton("✕")
+        self.close_btn.setFixedSize(30, 30)
+        self.close_btn.setToolTip("Close Application")
+        self.close_btn.setProperty("role", "tool")
+        self.close_btn.setObjectName("closeButton")
+        self.close_btn.clicked.connect(self.close_application)
+        layout.addWidget(self.close_btn)
+        
+        return bar
+    
+    def create_key_grid(self) -> QWidget:
+        grid_widget = QWidget()
+        main_layout = QVBoxLayout(grid_widget)
+        main_layout.setContentsMargins(0, 0, 0, 0)
+        main_layout.setSpacing(5)
+        
+        key_grid = QGridLayout()
+        key_grid.setSpacing(10)
+        
+        self.key_buttons = {}
+        f_keys = get_f_key_list()
+        
+        for idx, key_name in enumerate(f_keys):
+            row = idx // 3
+            col = idx % 3
+            
+            if self.engine.keypad is not None:
+                binding = self.engine.keypad.binding(self.engine.current_page, key_name)
+            else:
+                binding = default_binding(key_name)
+            
+            btn = KeyButton(key_name, binding)
+            btn.clicked_signal.connect(self.on_key_clicked)
+            self.key_buttons[key_name] = btn
+            key_grid.addWidget(btn, row, col)
+        
+        main_layout.addLayout(key_grid)
+        
+        return grid_widget
+    
+    def create_bottom_bar(self) -> QWidget:
+        bar = QWidget()
+        bar_layout = QVBoxLayout(bar)
+        bar_layout.setContentsMargins(0, 0, 0, 0)
+        bar_layout.setSpacing(6)
+        
+        layout = QHBoxLayout()
+        layout.setSpacing(8)
+        bar_layout.addLayout(layout)
+        
+        self.edit_btn = QPushButton("Edit Mode")
+        self.edit_btn.setCheckable(True)
+        self.edit_btn.setProperty("role", "toggle")
+        self.edit_btn.setProperty("accent", "cyan")
+        self.edit_btn.clicked.connect(self.toggle_edit_mode)
+        layout.addWidget(self.edit_btn)
+        
+        self.auto_repeat_btn = QPushButton("Auto Repeat")
+        self.auto_repeat_btn.setCheckable(True)
+        self.auto_repeat_btn.setProperty("role", "toggle")
+        self.auto_repeat_btn.setProperty("accent", "red")
+        self.auto_repeat_btn.clicked.connect(self.on_auto_repeat_clicked)
+        layout.addWidget(self.auto_repeat_btn)
+        
+        self.repeat_control_btn = QPushButton("Off")
+        self.repeat_control_btn.setCheckable(True)
+        self.repeat_control_btn.setProperty("role", "toggle")
+        self.repeat_control_btn.setProperty("accent", "green")
+        self.repeat_control_btn.clicked.connect(self.toggle_repeat_control)
+        layout.addWidget(self.repeat_control_btn)
+        
+        layout.addStretch()
+        
+        self.page_prev_btn = QPushButton("◀")
+        self.page_prev_btn.setFixedSize(22, 24)
+        self.page_prev_btn.setToolTip("Previous Page (PgUp)")
+        self.page_prev_btn.setProperty("role", "tool")
+        self.page_prev_btn.clicked.connect(lambda: self.engine.cycle_page(-1))
+        layout.addWidget(self.page_prev_btn)
+        
+        self.page_label = QLabel("1/1")
+        self.page_label.setProperty("role", "hint")
+        self.page_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.page_label)
+        
+        self.page_next_btn = QPushButton("▶")
+        self.page_next_btn.setFixedSize(22, 24)
+        self.page_next_btn.setToolTip("Next Page (PgDown)")
+        self.page_next_btn.setProperty("role", "tool")
+        self.page_next_btn.clicked.connect(lambda: self.engine.cycle_page(1))
+        layout.addWidget(self.page_next_btn)
+        
+        jobs_layout = QHBoxLayout()
+        jobs_layout.setSpacing(8)
+        
+        self.jobs_combo = QComboBox()
+        self.jobs_combo.setObjectName("jobsCombo")
+        self.jobs_combo.addItem("No repeat jobs", None)
+        self.jobs_combo.currentIndexChanged.connect(self.update_repeat_controls)
+        jobs_layout.addWidget(self.jobs_combo, 1)
+        
+        self.stop_job_btn = QPushButton("Stop")
+        self.stop_job_btn.setToolTip("Stop the selected repeat job")
+        self.stop_job_btn.setEnabled(False)
+        self.stop_job_btn.setProperty("role", "toggle")
+        self.stop_job_btn.setObjectName("stopJobButton")
+        self.stop_job_btn.clicked.connect(self.stop_selected_repeat_job)
+        jobs_layout.addWidget(self.stop_job_btn)
+        
+        bar_layout.addLayout(jobs_layout)
+        
+        return bar
+    
+    def init_tray(self):
+        self.tray = None
+        if not QSystemTrayIcon.isSystemTrayAvailable():
+            return
+        
+        self.tray = QSystemTrayIcon(self)
+        icon = self.style().standardIcon(QStyle.StandardPixmap.SP_DesktopIcon)
+        self.tray.setIcon(icon)
+        if self.engine.current_profile is not None:
+            self.tray.setToolTip(f"STACK-PAD v2.7.0 - {self.engine.current_profile.profile_name}")
+        else:
+            self.tray.setToolTip("STACK-PAD v2.7.0")
+        
+        tray_menu = QMenu()
+        
+        show_action = tray_menu.addAction("Show/Hide")
+        show_action.triggered.connect(self.toggle_visibility)
+        
+        lock_action = tray_menu.addAction("Lock Position")
+        lock_action.triggered.connect(self.toggle_lock)
+        
+        tray_menu.addSeparator()
+        
+        next_profile_action = tray_menu.addAction("Next Profile")
+        next_profile_action.triggered.connect(lambda: self.engine.cycle_profile(1))
+        
+        previous_profile_action = tray_menu.addAction("Previous Profile")
+        previous_profile_action.triggered.connect(lambda: self.engine.cycle_profile(-1))
+        
+        add_page_action = tray_menu.addAction("Add Page")
+        add_page_action.triggered.connect(self.engine.add_page)
+        
+        if self.engine.triggers.mapping:
+            latency_action = tray_menu.addAction("Hotkey Latency")
+            latency_action.triggered.connect(self.show_hotkey_latency)
+        
+        stats_action = tray_menu.addAction("Statistics…")
+        stats_action.triggered.connect(self.show_metrics)
+        
+        theme_menu = tray_menu.addMenu("Theme")
+        for theme_name in theme_engine.themes:
+            theme_action = theme_menu.addAction(theme_name.title())
+            theme_action.triggered.connect(lambda checked=False, name=theme_name: theme_engine.apply(name))
+        
+        tray_menu.addSeparator()
+        
+        exit_action = tray_menu.addAction("Exit")
+        exit_action.triggered.connect(self.close)
+        
+        self.tray.setContextMenu(tray_menu)
+        self.tray.activated.connect(self.on_tray_activated)
+        self.tray.show()
+    
+    def position_bottom_right(self):
+        screen = QApplication.primaryScreen().geometry()
+        x = screen.width() - self.width() - 20
+        y = screen.height() - self.height() - 50
+        self.move(x, y)
+    
+    def apply_bindings(self, bindings: dict[str, KeyBinding]):
+        changed = []
+        for key_name, btn in self.key_buttons.items():
+            binding = bindings.get(key_name)
+            if binding is None:
+                continue
+            if btn.differs_from(binding):
+                changed.append((btn, binding))
+            else:
+                btn.binding = binding
+        
+        if changed:
+            self.key_grid.setUpdatesEnabled(False)
+            try:
+                for btn, binding in changed:
+                    btn.update_binding(binding)
+            finally:
+                self.key_grid.setUpdatesEnabled(True)
+    
+    def update_page_controls(self):
+        page_count = self.engine.keypad.page_count if self.engine.keypad is not None else 1
+        self.page_label.setText(f"{self.engine.current_page + 1}/{page_count}")
+        for widget in (self.page_prev_btn, self.page_label, self.page_next_btn):
+            widget.setVisible(page_count > 1)
+    
+    def on_key_clicked(self, key_name: str):
+        if not self.edit_mode:
+            self.engine.press(key_name, clicked=True)
+            return
+        
+        binding = self.engine.resolve_slot(key_name)
+        if binding is None:
+            return
+        if self.edit_dialog is None:
+            self.edit_dialog = EditKeyDialog(self)
+        dialog = self.edit_dialog
+        dialog.set_binding(key_name, binding)
+        if dialog.exec():
+            new_binding = dialog.get_binding()
+            self.engine.update_binding(key_name, new_binding)
+            self.key_buttons[key_name].update_binding(new_binding)
+    
+    def on_auto_repeat_clicked(self):
+        if self.repeat_dialog is None:
+            self.repeat_dialog = RepeatKeyDialog(self)
+        dialog = self.repeat_dialog
+        dialog.reset()
+        if dialog.exec() and dialog.selected_key:
+            self.repeat_interval_ms = dialog.get_interval_ms()
+            self.start_repeat_job(
+                dialog.selected_key,
+                self.repeat_interval_ms,
+                dialog.get_max_count(),
+                dialog.get_max_duration_s(),
+                dialog.get_overrun_policy(),
+                dialog.get_burst_cap(),
+            )
+        else:
+            self.refresh_repeat_jobs()
+    
+    def toggle_repeat_control(self):
+        job = self.selected_repeat_job()
+        if job is None:
+            self.repeat_control_btn.setChecked(False)
+            self.on_auto_repeat_clicked()
+            return
+        
+        if self.repeat_control_btn.isChecked():
+            self.engine.repeat_jobs.resume(job.job_id)
+        else:
+            self.engine.repeat_jobs.pause(job.job_id)
+        self.refresh_repeat_jobs()
+    
+    def start_repeat_job(self, repeat_key: str, interval_ms: int = 1000,
+                         max_count: Optional[int] = None,
+                         max_duration_s: Optional[float] = None,
+                         overrun_policy: str = "skip",
+                         burst_cap: int = RepeatJob.DEFAULT_BURST_CAP) -> RepeatJob:
+        job = self.engine.start_repeat_job(
+            repeat_key, interval_ms, max_count, max_duration_s, overrun_policy, burst_cap
+        )
+        self.refresh_repeat_jobs(select_job_id=job.job_id)
+        self.repeat_stats_timer.start(1000)
+        return job
+    
+    def stop_selected_repeat_job(self):
+        job = self.selected_repeat_job()
+        if job is not None:
+            self.engine.repeat_jobs.stop(job.job_id)
+        self.refresh_repeat_jobs()
+    
+    def stop_all_repeat_jobs(self):
+        self.engine.repeat_jobs.stop_all()
+        self.repeat_stats_timer.stop()
+    
+    def selected_repeat_job(self) -> Optional[RepeatJob]:
+        job_id = self.jobs_combo.currentData()
+        if job_id is None:
+            return None
+        return self.engine.repeat_jobs.get(job_id)
+    
+    def show_metrics(self):
+        if self.metrics_dialog is None:
+            self.metrics_dialog = MetricsDialog(self.engine.dispatcher.metrics, self)
+        self.metrics_dialog.show()
+        self.metrics_dialog.raise_()
+        self.metrics_dialog.activateWindow()
+    
+    def show_hotkey_latency(self):
+        QMessageBox.information(self, "Hotkey Latency", self.engine.triggers.latency.summary())
+    
+    def describe_repeat_job(self, job: RepeatJob) -> str:
+        text = job.describe()
+        if not job.stats.is_attainable():
+            text += f" ⚠ {job.stats.achieved_rate_hz():.0f}/s"
+        return text
+    
+    def refresh_repeat_jobs(self, select_job_id: Optional[int] = None):
+        jobs = self.engine.repeat_jobs.jobs()
+        job_ids = [job.job_id for job in jobs]
+        current_ids = [self.jobs_combo.itemData(i) for i in range(self.jobs_combo.count())]
+        
+        if select_job_id is None:
+            select_job_id = self.jobs_combo.currentData()
+        
+        self.jobs_combo.blockSignals(True)
+        if job_ids == current_ids and jobs:
+            for index, job in enumerate(jobs):
+                self.jobs_combo.setItemText(index, self.describe_repeat_job(job))
+        else:
+            self.jobs_combo.clear()
+            for job in jobs:
+                self.jobs_combo.addItem(self.describe_repeat_job(job), job.job_id)
+            if not jobs:
+                self.jobs_combo.addItem("No repeat jobs", None)
+        index = self.jobs_combo.findData(select_job_id) if select_job_id is not None else -1
+        self.jobs_combo.setCurrentIndex(index if index >= 0 else self.jobs_combo.count() - 1)
+        self.jobs_combo.blockSignals(False)
+        
+        self.update_repeat_controls()
+        if not jobs:
+            self.repeat_stats_timer.stop()
+        elif not self.repeat_stats_timer.isActive():
+            self.repeat_stats_timer.start(1000)
+    
+    def update_repeat_controls(self):
+        running = self.engine.repeat_jobs.active_count()
+        self.auto_repeat_btn.setChecked(running > 0)
+        self.auto_repeat_btn.setText(f"Auto Repeat ({running})" if running else "Auto Repeat")
+        
+        job = self.selected_repeat_job()
+        is_running = job is not None and job.state == "running"
+        self.repeat_control_btn.setChecked(is_running)
+        self.repeat_control_btn.setText("On" if is_running else "Off")
+        self.stop_job_btn.setEnabled(job is not None)
+        self.jobs_combo.setToolTip(
+            f"{job.stats.summary()}\n{job.overrun_summary()}" if job is not None else ""
+        )
+    
+    def toggle_edit_mode(self):
+        self.edit_mode = self.edit_btn.isChecked()
+        if self.edit_mode:
+            self.edit_btn.setText("Edit Mode ON")
+        else:
+            self.edit_btn.setText("Edit Mode")
+    
+    def toggle_lock(self):
+        self.position_locked = not self.position_locked
+        if self.position_locked:
+            self.lock_btn.setText("🔒")
+            self.lock_btn.setToolTip("Position Locked")
+        else:
+            self.lock_btn.setText("🔓")
+            self.lock_btn.setToolTip("Position Unlocked")
+    
+    def toggle_minimize(self):
+        if self.is_minimized:
+            self.show_main_window()
+        else:
+            self.hide_to_button()
+    
+    def close_application(self):
+        reply = QMessageBox.question(
+            self, "Close Application",
+            "Do you want to close the application?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        if reply == QMessageBox.Yes:
+            self.quit_application()
+    
+    def quit_application(self):
+        self.stop_all_repeat_jobs()
+        
+        if self.minimize_button is not None:
+            self.minimize_button.hide()
+        
+        self.engine.shutdown()
+        QApplication.quit()
+    
+    def hide_to_button(self):
+        self.saved_pos = self.pos()
+        
+        self.hide()
+        self.is_minimized = True
+        
+        if self.minimize_button is None:
+            self.minimize_button = self.create_minimize_button()
+        
+        if hasattr(self, 'saved_pos'):
+            self.minimize_button.move(self.saved_pos)
+        else:
+            screen = QApplication.primaryScreen().geometry()
+            x = screen.width() - 50
+            y = screen.height() - 50
+            self.minimize_button.move(x, y)
+        
+        self.minimize_button.show()
+        self.minimize_button.raise_()
+        self.minimize_button.activateWindow()
+    
+    def create_minimize_button(self) -> QWidget:
+        button = QWidget()
+        button.setWindowFlags(
+            Qt.WindowStaysOnTopHint |
+            Qt.FramelessWindowHint |
+            Qt.Tool
+        )
+        button.setAttribute(Qt.WA_TranslucentBackground, False)
+        button.setFixedSize(35, 35)
+        button.setObjectName("minimizeButton")
+        
+        button.mousePressEvent = self.minimize_button_press
+        button.mouseMoveEvent = self.minimize_button_move
+        button.mouseReleaseEvent = self.minimize_button_release
+        button.mouseDoubleClickEvent = lambda e: self.show_main_window()
+        
+        layout = QVBoxLayout(button)
+        layout.setContentsMargins(0, 0, 0, 0)
+        label = QLabel("👁")
+        label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(label)
+        return button
+    
+    def show_main_window(self):
+        if self.minimize_button is not None:
+            if self.minimize_button.isVisible():
+                self.saved_pos = self.minimize_button.pos()
+            self.minimize_button.hide()
+        
+        self.is_minimized = False
+        
+        if hasattr(self, 'saved_pos'):
+            self.move(self.saved_pos)
+        self.show()
+        self.raise_()
+        self.activateWindow()
+    
+    def minimize_button_press(self, event):
+        if event.button() == Qt.LeftButton:
+            self.minimize_old_pos = event.globalPosition().toPoint()
+            self.minimize_click_start = event.globalPosition().toPoint()
+    
+    def minimize_button_move(self, event):
+        if hasattr(self, 'minimize_old_pos'):
+            delta = event.globalPosition().toPoint() - self.minimize_old_pos
+            self.minimize_button.move(self.minimize_button.pos() + delta)
+            self.minimize_old_pos = event.globalPosition().toPoint()
+    
+    def minimize_button_release(self, event):
+        if hasattr(self, 'minimize_old_pos'):
+            if hasattr(self, 'minimize_click_start'):
+                moved = (event.globalPosition().toPoint() - self.minimize_click_start).manhattanLength()
+                if moved < 5:
+                    self.show_main_window()
+                delattr(self, 'minimize_click_start')
+            delattr(self, 'minimize_old_pos')
+    
+    
+    def toggle_visibility(self):
+        if self.isVisible():
+            self.hide()
+        else:
+            self.show()
+            self.raise_()
+            self.activateWindow()
+    
+    def on_tray_activated(self, reason):
+        if reason == QSystemTrayIcon.DoubleClick:
+            self.toggle_visibility()
+    
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton and not self.position_locked:
+            self.old_pos = event.globalPosition().toPoint()
+        super().mousePressEvent(event)
+    
+    def mouseMoveEvent(self, event):
+        if self.old_pos and not self.position_locked:
+            delta = event.globalPosition().toPoint() - self.old_pos
+            self.move(self.pos() + delta)
+            self.old_pos = event.globalPosition().toPoint()
+        super().mouseMoveEvent(event)
+    
+    def mouseReleaseEvent(self, event):
+        self.old_pos = None
+        super().mouseReleaseEvent(event)
+    
+    def closeEvent(self, event):
+        self.stop_all_repeat_jobs()
+        
+        if self.minimize_button is not None:
+            self.minimize_button.hide()
+        
+        if self.tray is not None and self.tray.isVisible():
+            QMessageBox.information(
+                self, "Keys Pad",
+                "The application will continue to run in the system tray.\n"
+                "To quit, choose Exit from the tray menu."
+            )
+            self.hide()
+            event.ignore()
+        else:
+            self.engine.shutdown()
+            event.accept()
+
+
+def run(args, qt_argv: list[str]) -> int:
+    if not args.profile_startup:
+        hide_console()
+    
+    app = QApplication(qt_argv)
+    app.setQuitOnLastWindowClosed(False)
+    startup_profiler.mark("qapp")
+    
+    window = MainWindow(open_engine(args))
+    startup_profiler.mark("window")
+    window.show()
+    startup_profiler.mark("show")
+    
+    def finish_startup():
+        startup_profiler.mark("first paint")
+        window.finish_startup()
+        if args.control:
+            try:
+                window.engine.start_control_server(args.control)
+            except Exception as exc:
+                QMessageBox.warning(window, "Control Server", f"Could not listen on {args.control}:\n{exc}")
+        startup_profiler.mark("deferred")
+        if args.profile_startup:
+            print(startup_profiler.report())
+            print(window.engine.config_manager.timing_report())
+            window.quit_application()
+    
+    QTimer.singleShot(0, finish_startup)
+    return app.exec()